@@ -0,0 +1,31 @@
+"""
+Configuración de gunicorn; se carga sola desde el directorio de trabajo
+(/app en docker-compose).
+"""
+
+import os
+
+# Sin ``from decouple import config``: gunicorn lo tomaría por su opción ``config``
+import decouple
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "myproject.settings")
+
+# Mismos valores que settings.WEB_CONCURRENCY / WEB_THREADS (myproject.E001).
+# El login espera el PBKDF2 del hashing_pool: con threads > 1 gunicorn usa
+# workers gthread y los demás requests del worker siguen atendiéndose; con
+# WEB_THREADS=1 (workers sync) cada login bloquearía el worker completo.
+workers = decouple.config("WEB_CONCURRENCY", default=1, cast=int)
+threads = decouple.config("WEB_THREADS", default=4, cast=int)
+
+
+def child_exit(server, worker):
+    # El snapshot de /metrics de un worker muerto no debe seguir sumando
+    from django.conf import settings
+    from myproject.metrics import remove_snapshot
+
+    remove_snapshot(settings.METRICS_DIR, worker.pid)
+
+
+def worker_exit(server, worker):
+    # Salida ordenada (reload, shutdown): el master no siempre llama child_exit
+    child_exit(server, worker)
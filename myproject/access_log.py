@@ -0,0 +1,110 @@
+import logging
+import os
+import queue
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger("django.request")
+
+
+class AccessLogQueue:
+    """
+    Cola acotada para el access log.
+
+    Los requests solo hacen ``put_nowait``; un hilo en segundo plano saca
+    los registros por lotes, los formatea y los entrega al logger. Si la cola
+    está llena el registro se descarta y se cuenta en ``dropped``.
+    """
+
+    def __init__(self, maxsize=10000, batch_size=256):
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.dropped = 0
+        self.written = 0
+        self._reported_dropped = 0
+        self._queue = queue.Queue(maxsize)
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_writer(self):
+        # Tras un fork el hilo no existe en el worker hijo: se vuelve a crear
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(self.maxsize)
+                threading.Thread(
+                    target=self._run, name="access-log-writer", daemon=True
+                ).start()
+                self._pid = os.getpid()
+
+    def put(self, record):
+        """
+        ``record`` = (method, path, status, user, ip, duration, queries,
+        db_duration, repeated); ``repeated`` es ``(veces, sql)`` o None
+        """
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        for record in batch:
+            method, path, status, user, ip, duration, queries, db, repeated = record
+            logger.warning(
+                f"{method} {path} | status={status} | user={user} | ip={ip} "
+                f"| {duration}s | db={queries}q/{db}s"
+            )
+            if repeated:
+                times, sql = repeated
+                logger.warning(
+                    f"N+1 {method} {path} | {times} queries con la misma forma: "
+                    f"{sql[:300]}"
+                )
+        self.written += len(batch)
+
+        dropped = self.dropped
+        if dropped != self._reported_dropped:
+            logger.error(
+                f"ACCESS LOG | {dropped - self._reported_dropped} registros descartados"
+                " (cola llena)"
+            )
+            self._reported_dropped = dropped
+
+    def flush(self):
+        """Bloquea hasta que el hilo escritor vacíe la cola (tests / shutdown)"""
+        if self._pid == os.getpid():
+            self._queue.join()
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+access_log = AccessLogQueue(
+    maxsize=getattr(settings, "ACCESS_LOG_QUEUE_SIZE", 10000),
+    batch_size=getattr(settings, "ACCESS_LOG_BATCH_SIZE", 256),
+)
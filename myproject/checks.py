@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+from django.db import DatabaseError, connections
+
+
+@register(Tags.database)
+def check_connection_budget(app_configs, databases=None, **kwargs):
+    """
+    Workers de gunicorn × conexiones por worker no deben superar
+    ``max_connections`` de Postgres (menos las reservadas). Solo corre con
+    ``--database`` (p. ej. en ``migrate``), porque consulta el servidor.
+    """
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            continue
+
+        pool = connection.settings_dict.get("OPTIONS", {}).get("pool")
+        if pool:
+            per_worker = pool.get("max_size", 4) if isinstance(pool, dict) else 4
+        else:
+            per_worker = settings.WEB_THREADS
+        needed = settings.WEB_CONCURRENCY * per_worker
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW max_connections")
+                max_connections = int(cursor.fetchone()[0])
+        except DatabaseError:
+            continue
+
+        available = max_connections - settings.DB_RESERVED_CONNECTIONS
+        if needed > available:
+            errors.append(
+                Error(
+                    f"{settings.WEB_CONCURRENCY} workers × {per_worker} conexiones "
+                    f"= {needed}, pero '{alias}' admite {available} "
+                    f"(max_connections={max_connections}, reservadas="
+                    f"{settings.DB_RESERVED_CONNECTIONS}).",
+                    hint="Baja WEB_CONCURRENCY / DB_POOL_MAX_SIZE o sube "
+                    "max_connections en Postgres.",
+                    id="myproject.E001",
+                )
+            )
+    return errors
@@ -0,0 +1,106 @@
+"""
+Lecturas a réplicas con read-your-writes.
+
+``ReplicaMiddleware`` activa un ``RoutingState`` en una ContextVar por
+request: GET/HEAD/OPTIONS pueden leer de las réplicas de
+``DB_REPLICAS``; el resto va al primario. Si un request escribe, la
+respuesta lleva la cookie ``DB_PIN_COOKIE`` y ese cliente lee del primario
+durante ``DB_PIN_SECONDS`` (lo que tarda la réplica en alcanzarlo).
+
+Fuera de un request (shell, comandos, hilos de fondo) todo va al primario.
+"""
+
+import itertools
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_current = ContextVar("db_routing", default=None)
+_counter = itertools.count()
+
+
+class RoutingState:
+    def __init__(self, use_replica):
+        self.use_replica = use_replica
+        self.wrote = False
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current.get()
+        if state is None or not state.use_replica:
+            return DEFAULT_DB_ALIAS
+        replicas = getattr(settings, "DB_REPLICAS", [])
+        if not replicas or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Dentro de una transacción se lee lo que ella misma escribió
+            return DEFAULT_DB_ALIAS
+        return replicas[next(_counter) % len(replicas)]
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            # El resto del request (y los siguientes, vía cookie) al primario
+            state.use_replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas y primario tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db not in getattr(settings, "DB_REPLICAS", [])
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.cookie = getattr(settings, "DB_PIN_COOKIE", "db_primary")
+        self.pin_seconds = getattr(settings, "DB_PIN_SECONDS", 5)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        state = self.state_for(request)
+        token = _current.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.pin(state, response)
+
+    async def __acall__(self, request):
+        state = self.state_for(request)
+        token = _current.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.pin(state, response)
+
+    def state_for(self, request):
+        return RoutingState(
+            request.method in SAFE_METHODS and self.cookie not in request.COOKIES
+        )
+
+    def pin(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                self.cookie,
+                "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,195 @@
+"""
+Presupuesto de tiempo (deadline) por endpoint.
+
+Cada vista tiene un presupuesto en segundos: el atributo ``deadline`` de la
+vista, de la acción del ViewSet o de su clase (``@deadline(2)`` lo pone), o
+``REQUEST_DEADLINE`` por defecto. ``DeadlineMiddleware`` fija el vencimiento
+del request en una ContextVar; el ``execute_wrapper`` de cada conexión lo
+consulta antes de cada query:
+
+- si el presupuesto ya se agotó, no ejecuta la query;
+- en Postgres, ajusta ``statement_timeout`` de la sesión al tiempo
+  restante (solo si cambió: ver ``RequestDeadline.statement_timeout``);
+- si Postgres cancela la query por timeout, la convierte en 503.
+
+Las conexiones se reutilizan (CONN_MAX_AGE, pool): la primera query de cada
+request o de código fuera de un request restablece el timeout que necesita,
+así ningún ``statement_timeout`` sobrevive al request que lo fijó.
+"""
+
+import time
+import weakref
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_current = ContextVar("deadline", default=None)
+# statement_timeout fijado en cada conexión cruda de psycopg (ms, 0 = sin límite)
+_session_timeouts = weakref.WeakKeyDictionary()
+
+UNKNOWN = -1
+
+# SQLSTATE de "canceling statement due to statement timeout"
+QUERY_CANCELED = "57014"
+
+
+class DeadlineExceeded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "La solicitud excedió su tiempo máximo, intente nuevamente."
+    default_code = "deadline_exceeded"
+
+
+def deadline(seconds):
+    """Decorador de vista (función o clase): presupuesto de ``seconds``"""
+
+    def decorator(view):
+        view.deadline = seconds
+        return view
+
+    return decorator
+
+
+def view_deadline(view_func, method=None):
+    seconds = getattr(view_func, "deadline", None)
+    # as_view() de DRF expone .cls; el de Django, .view_class
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    actions = getattr(view_func, "actions", None)
+    if seconds is None and actions and method:
+        # ViewSet: @deadline en la acción (p. ej. una @action lenta)
+        handler = getattr(view_class, actions.get(method.lower(), ""), None)
+        seconds = getattr(handler, "deadline", None)
+    if seconds is None:
+        seconds = getattr(view_class, "deadline", None)
+    if seconds is None:
+        seconds = getattr(settings, "REQUEST_DEADLINE", 0)
+    return seconds
+
+
+class RequestDeadline:
+    def __init__(self):
+        self.expires_at = None
+        self.timeout_ms = 0
+
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def statement_timeout(self, remaining):
+        """
+        ``statement_timeout`` (ms) para la próxima query. Se recalcula solo
+        cuando queda menos de la mitad del último valor: pocas queries SET
+        por request, y ninguna query excede el deadline en más del doble.
+        """
+        if remaining is None:
+            return 0
+        remaining_ms = remaining * 1000
+        if not self.timeout_ms or remaining_ms < self.timeout_ms / 2:
+            # Redondeo hacia arriba: 0 desactivaría el timeout
+            self.timeout_ms = int(remaining_ms) + 1
+        return self.timeout_ms
+
+
+class DeadlineMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = _current.set(RequestDeadline())
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+
+    async def __acall__(self, request):
+        token = _current.set(RequestDeadline())
+        try:
+            return await self.get_response(request)
+        finally:
+            _current.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _current.get()
+        seconds = view_deadline(view_func, request.method)
+        if state is not None and seconds:
+            state.expires_at = time.monotonic() + seconds
+
+    def process_exception(self, request, exception):
+        # Vistas que no son de DRF: mismo 503 que DeadlineExceeded en DRF
+        if isinstance(exception, DeadlineExceeded):
+            return JsonResponse(
+                {"detail": str(exception.detail)},
+                status=exception.status_code,
+            )
+        return None
+
+
+def _set_statement_timeout(connection, timeout_ms):
+    """``SET statement_timeout`` en la sesión si difiere del último fijado"""
+    raw = connection.connection
+    current = _session_timeouts.get(raw)
+    if current is None and getattr(connection, "pool", None) is None:
+        # Conexión recién abierta: tiene el timeout por defecto del servidor.
+        # Las del pool pueden venir con el SET de otro hilo: no se asume nada
+        current = 0
+    if current == timeout_ms:
+        return
+    # Cursor crudo y propio: no pasa por los execute_wrappers (ni cuenta en
+    # sql_stats), y el de la query puede ser un cursor con nombre
+    # (.iterator()), que envolvería el SET en un DECLARE
+    with raw.cursor() as cursor:
+        cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+    # Dentro de una transacción un ROLLBACK deshace el SET: valor desconocido
+    _session_timeouts[raw] = UNKNOWN if connection.in_atomic_block else timeout_ms
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    connection = context["connection"]
+    state = _current.get()
+    remaining = state.remaining() if state is not None else None
+
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded()
+
+    if connection.vendor != "postgresql":
+        return execute(sql, params, many, context)
+
+    timeout_ms = state.statement_timeout(remaining) if state is not None else 0
+    _set_statement_timeout(connection, timeout_ms)
+    try:
+        return execute(sql, params, many, context)
+    except OperationalError as e:
+        cause = e.__cause__
+        sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+        if remaining is not None and sqlstate == QUERY_CANCELED:
+            raise DeadlineExceeded() from e
+        raise
+
+
+def install(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+connection_created.connect(install, dispatch_uid="deadlines_install")
+
+# Conexiones ya abiertas antes de importar el módulo (shell, tests)
+for _connection in connections.all(initialized_only=True):
+    install(_connection)
@@ -0,0 +1,156 @@
+"""
+/health/ (liveness) y /ready/ (readiness) servidos antes del resto del stack.
+
+``HealthCheckMiddleware`` va primero en MIDDLEWARE: contesta sin sesiones,
+autenticación, throttling ni access log. /ready/ no toca la BD; devuelve
+el último snapshot de ``ReadinessProbe``, que un hilo por worker refresca
+cada ``interval`` segundos (BD, caché y migraciones pendientes). El hilo
+arranca al cargar el middleware, así el primer /ready/ ya tiene snapshot.
+"""
+
+import os
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+
+HEALTH_PATHS = {"/health/", "/health"}
+READY_PATHS = {"/ready/", "/ready"}
+
+
+class ReadinessProbe:
+    def __init__(self, interval=5, stale_after=30):
+        self.interval = interval
+        self.stale_after = stale_after
+        self.snapshot = None
+        self._migrated = False
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self):
+        self._ensure_thread()
+
+    def stop(self):
+        """Termina el hilo tras la vuelta en curso"""
+        self._stop.set()
+
+    def _ensure_thread(self):
+        # El hilo no sobrevive al fork del worker: se crea en cada proceso
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                threading.Thread(
+                    target=self._run, name="readiness-probe", daemon=True
+                ).start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        connection = connections[DEFAULT_DB_ALIAS]
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            finally:
+                # Conexión propia del hilo: se cierra (o vuelve al pool) tras
+                # cada vuelta, así no ocupa una conexión fuera del presupuesto
+                # de workers (myproject.E001)
+                connection.close()
+            self._stop.wait(self.interval)
+
+    def refresh(self):
+        checks = {
+            "database": _timed(self._check_database),
+            "cache": _timed(self._check_cache),
+            "migrations": _timed(self._check_migrations),
+        }
+        self.snapshot = {
+            "ready": all(check["ok"] for check in checks.values()),
+            "checked_at": time.time(),
+            "checks": checks,
+        }
+        return self.snapshot
+
+    def _check_database(self):
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT 1")
+        return {}
+
+    def _check_cache(self):
+        value = str(time.time())
+        cache.set("readiness_probe", value, 60)
+        if cache.get("readiness_probe") != value:
+            raise RuntimeError("la caché no devolvió el valor escrito")
+        return {}
+
+    def _check_migrations(self):
+        # Una vez aplicadas no se vuelven a leer los archivos de migración
+        if self._migrated:
+            return {"pending": 0}
+        executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if plan:
+            raise RuntimeError(f"{len(plan)} migraciones pendientes")
+        self._migrated = True
+        return {"pending": 0}
+
+    def status(self):
+        """``(http_status, cuerpo)`` a partir del último snapshot"""
+        self._ensure_thread()
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, {"ready": False, "error": "sin snapshot todavía"}
+        age = time.time() - snapshot["checked_at"]
+        if age > self.stale_after:
+            return 503, {**snapshot, "ready": False, "error": "snapshot vencido"}
+        return (200 if snapshot["ready"] else 503), snapshot
+
+
+def _timed(check):
+    start = time.perf_counter()
+    try:
+        result = {"ok": True, **check()}
+    except Exception as e:
+        result = {"ok": False, "error": str(e)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+readiness_probe = ReadinessProbe(
+    interval=getattr(settings, "READINESS_INTERVAL", 5),
+    stale_after=getattr(settings, "READINESS_STALE_AFTER", 30),
+)
+
+
+class HealthCheckMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # Con --preload el hilo no sobrevive al fork; status() lo recrea
+        readiness_probe.start()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.probe(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.probe(request) or await self.get_response(request)
+
+    def probe(self, request):
+        if request.path in HEALTH_PATHS:
+            return JsonResponse({"status": "ok"})
+        if request.path in READY_PATHS:
+            status, body = readiness_probe.status()
+            return JsonResponse(body, status=status)
+        return None
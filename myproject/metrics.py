@@ -0,0 +1,256 @@
+"""
+Métricas HTTP en proceso con exportación en formato de texto de Prometheus.
+
+Cada worker acumula histogramas de latencia de buckets fijos y contadores
+de status por ruta resuelta (``api/login/``, no el path crudo). Un hilo
+por worker vuelca su snapshot a ``METRICS_DIR/<pid>.json`` cada
+``dump_interval`` segundos; el endpoint /metrics suma los snapshots de
+todos los workers del host.
+
+Los snapshots de workers que ya no existen no se suman: se borran si su
+pid no está vivo o si el archivo no se actualizó en ``STALE_INTERVALS``
+intervalos (worker colgado, o pid reutilizado por otro proceso). El hook
+``child_exit`` de gunicorn (gunicorn.conf.py) además borra el archivo en
+cuanto el master recoge al worker.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+
+from .access_log import access_log
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Intervalos sin volcar tras los que un snapshot se considera huérfano
+STALE_INTERVALS = 3
+
+
+def snapshot_path(directory, pid):
+    return os.path.join(directory, f"{pid}.json")
+
+
+def remove_snapshot(directory, pid):
+    try:
+        os.remove(snapshot_path(directory, pid))
+    except FileNotFoundError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Existe, pero es de otro usuario
+        return True
+    return True
+
+
+class RequestMetrics:
+    def __init__(self, directory, dump_interval=5):
+        self.directory = directory
+        self.dump_interval = dump_interval
+        self._histograms = {}
+        self._statuses = defaultdict(int)
+        self._collectors = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._dumper_lock = threading.Lock()
+
+    @property
+    def stale_after(self):
+        return self.dump_interval * STALE_INTERVALS
+
+    def _ensure_dumper(self):
+        # Tras un fork el hilo no existe en el worker hijo: se vuelve a crear
+        if self._pid == os.getpid():
+            return
+        with self._dumper_lock:
+            if self._pid != os.getpid():
+                threading.Thread(
+                    target=self._run, name="metrics-dumper", daemon=True
+                ).start()
+                self._pid = os.getpid()
+
+    def _run(self):
+        # Vuelca aunque el worker esté ocioso: el mtime del archivo es su
+        # latido, y sin él /metrics lo descartaría por huérfano
+        while True:
+            try:
+                self.dump()
+            except OSError:
+                pass
+            time.sleep(self.dump_interval)
+            if not os.path.isdir(self.directory):
+                # Directorio borrado (p. ej. tmp de un test): el próximo
+                # observe() arranca otro hilo, que lo vuelve a crear
+                self._pid = None
+                return
+
+    def observe(self, route, method, status, duration):
+        self._ensure_dumper()
+        bucket = bisect_left(BUCKETS, duration)
+        with self._lock:
+            histogram = self._histograms.get((route, method))
+            if histogram is None:
+                histogram = self._histograms[(route, method)] = [
+                    [0] * (len(BUCKETS) + 1),
+                    0.0,
+                ]
+            histogram[0][bucket] += 1
+            histogram[1] += duration
+            self._statuses[(route, method, str(status))] += 1
+
+    def register_collector(self, collector):
+        """``collector()`` devuelve contadores ``{nombre: valor}`` del worker"""
+        self._collectors.append(collector)
+
+    def snapshot(self):
+        counters = {}
+        for collector in self._collectors:
+            counters.update(collector())
+        with self._lock:
+            return {
+                "histograms": [
+                    [route, method, list(counts), total]
+                    for (route, method), (counts, total) in self._histograms.items()
+                ],
+                "statuses": [
+                    [route, method, status, count]
+                    for (route, method, status), count in self._statuses.items()
+                ],
+                "counters": counters,
+            }
+
+    def dump(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = snapshot_path(self.directory, os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def _snapshots(self):
+        yield self.snapshot()
+        own = f"{os.getpid()}.json"
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return
+        now = time.time()
+        for name in names:
+            if not name.endswith(".json") or name == own:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                pid = int(name.removesuffix(".json"))
+                stale = now - os.path.getmtime(path) > self.stale_after
+            except (OSError, ValueError):
+                continue
+            if stale or not _pid_alive(pid):
+                remove_snapshot(self.directory, pid)
+                continue
+            try:
+                with open(path) as f:
+                    yield json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def aggregate(self):
+        histograms = {}
+        statuses = defaultdict(int)
+        counters = defaultdict(float)
+        for snapshot in self._snapshots():
+            for route, method, counts, total in snapshot["histograms"]:
+                merged = histograms.setdefault(
+                    (route, method), [[0] * len(counts), 0.0]
+                )
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+            for route, method, status, count in snapshot["statuses"]:
+                statuses[(route, method, status)] += count
+            for name, value in snapshot.get("counters", {}).items():
+                counters[name] += value
+        return histograms, statuses, counters
+
+    def render(self):
+        histograms, statuses, counters = self.aggregate()
+        lines = [
+            "# HELP http_request_duration_seconds Latencia de requests por ruta.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), (counts, total) in sorted(histograms.items()):
+            labels = f'route="{_escape(route)}",method="{method}"'
+            cumulative = 0
+            for le, count in zip(BUCKETS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(
+                    f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(
+                f"http_request_duration_seconds_count{{{labels}}} {cumulative}"
+            )
+
+        lines += [
+            "# HELP http_requests_total Requests por ruta, método y status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(statuses.items()):
+            lines.append(
+                f'http_requests_total{{route="{_escape(route)}",method="{method}",'
+                f'status="{status}"}} {count}'
+            )
+
+        for name, value in sorted(counters.items()):
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value:g}")
+
+        return "\n".join(lines) + "\n"
+
+
+def db_pool_stats():
+    """Estadísticas del pool de psycopg por alias (vacío si no hay pool)"""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is None:
+            continue
+        for key, value in pool.get_stats().items():
+            # pool_* y requests_waiting son gauges; el resto, acumulados
+            gauge = key.startswith("pool_") or key == "requests_waiting"
+            name = f"db_pool_{key}" if gauge else f"db_pool_{key}_total"
+            stats[name if alias == "default" else f"{name}_{alias}"] = value
+    return stats
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+request_metrics = RequestMetrics(
+    directory=getattr(
+        settings,
+        "METRICS_DIR",
+        os.path.join(tempfile.gettempdir(), "payo_metrics"),
+    ),
+    dump_interval=getattr(settings, "METRICS_DUMP_INTERVAL", 5),
+)
+request_metrics.register_collector(
+    lambda: {
+        "access_log_written_total": access_log.written,
+        "access_log_dropped_total": access_log.dropped,
+    }
+)
+request_metrics.register_collector(db_pool_stats)
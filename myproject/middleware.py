@@ -1,28 +1,66 @@
-import logging
 import time
 
-logger = logging.getLogger("django.request")
+from django.conf import settings
+
+from . import sql_stats
+from .access_log import access_log
+from .metrics import request_metrics
+from .profiler import request_profiler
 
 
 class RequestLoggingMiddleware:
+    # Solo síncrono a propósito: con vistas síncronas, una versión async
+    # añade en ASGI un salto sync_to_async para la vista y otro para el
+    # render (ver ``manage.py bench_handlers``). Así Django hace un único
+    # salto aquí y el resto del request corre en ese hilo.
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.server_timing = getattr(settings, "SERVER_TIMING_ENABLED", True)
 
     def __call__(self, request):
         start_time = time.time()
+        stats, token = sql_stats.start()
+        profile = request_profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            sql_stats.stop(token)
+
+        user = request.user if request.user.is_authenticated else "Anonymous"
+        self.record(request, response, start_time, user, stats, profile)
 
-        response = self.get_response(request)
+        return response
 
-        duration = round(time.time() - start_time, 3)
+    def record(self, request, response, start_time, user, stats, profile):
+        elapsed = time.time() - start_time
+        duration = round(elapsed, 3)
 
-        user = request.user if request.user.is_authenticated else "Anonymous"
         ip = request.META.get("REMOTE_ADDR")
         path = request.path
         method = request.method
         status = response.status_code
 
-        logger.warning(
-            f"{method} {path} | status={status} | user={user} | ip={ip} | {duration}s"
+        if self.server_timing:
+            response["Server-Timing"] = stats.server_timing(elapsed)
+
+        # El formateo y la escritura ocurren en el hilo del access_log
+        access_log.put(
+            (
+                method,
+                path,
+                status,
+                str(user),
+                ip,
+                duration,
+                stats.count,
+                round(stats.duration, 3),
+                stats.repeated(),
+            )
         )
 
-        return response
+        # Métricas por ruta resuelta, no por path crudo (evita cardinalidad alta)
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match else "<unmatched>"
+        request_metrics.observe(route, method, status, elapsed)
+        request_profiler.stop(profile, f"{method} {route}", elapsed)
@@ -0,0 +1,231 @@
+"""
+Caché de objetos en dos niveles con invalidación por versión de namespace.
+
+Nivel 1: LRU por proceso (worker), retiene cada entrada ``local_ttl``
+segundos. Nivel 2: el alias ``OBJECT_CACHE_ALIAS`` de CACHES, compartido por
+los workers del host. Cada clave lleva la versión de su namespace
+(``users.user``, ``products.product``…): ``invalidate(namespace)`` es un
+solo ``incr`` y deja huérfanas todas las entradas anteriores en ambos
+niveles, sin recorrerlas. Las versiones también se retienen ``local_ttl``
+segundos en el nivel 1 (un acierto local no consulta la caché
+compartida): una invalidación de otro worker se ve en este a más tardar en
+ese plazo; las del propio worker, de inmediato.
+
+En un fallo, un solo hilo del host calcula el valor (lock con ``add``); el
+resto espera a que aparezca en la caché compartida en vez de repetir la
+query (protección contra estampidas).
+
+Los valores devueltos son compartidos entre requests del worker: tratarlos
+como de solo lectura.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import request_metrics
+
+_MISSING = object()
+
+
+class ObjectCache:
+    def __init__(
+        self, alias="default", maxsize=1024, local_ttl=5, timeout=300, lock_timeout=10
+    ):
+        self.alias = alias
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._local = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    # --- namespaces ---
+
+    def _version_key(self, namespace):
+        return f"objcache:ns:{namespace}"
+
+    def version(self, namespace):
+        with self._lock:
+            entry = self._versions.get(namespace)
+        if entry is not None and entry[1] >= time.monotonic():
+            return entry[0]
+
+        version_key = self._version_key(namespace)
+        version = self.shared.get(version_key)
+        if version is None:
+            # Nunca reiniciar en 1: si la clave se perdió, no reaparecen
+            # entradas viejas de la misma versión
+            self.shared.add(version_key, time.time_ns(), timeout=None)
+            version = self.shared.get(version_key)
+        self._remember_version(namespace, version)
+        return version
+
+    def _remember_version(self, namespace, version):
+        with self._lock:
+            self._versions[namespace] = (version, time.monotonic() + self.local_ttl)
+
+    def invalidate(self, namespace):
+        """Invalida todo el namespace en O(1): sube su versión"""
+        version_key = self._version_key(namespace)
+        try:
+            version = self.shared.incr(version_key)
+        except ValueError:
+            version = time.time_ns()
+            self.shared.set(version_key, version, timeout=None)
+        self._remember_version(namespace, version)
+
+    # --- nivel local ---
+
+    def _local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value):
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + self.local_ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+            self._versions.clear()
+
+    # --- API ---
+
+    def get_or_compute(self, namespace, key, compute, timeout=None):
+        full_key = f"objcache:{namespace}:{self.version(namespace)}:{key}"
+
+        value = self._local_get(full_key)
+        if value is not _MISSING:
+            self.local_hits += 1
+            return copy.copy(value)
+
+        value = self.shared.get(full_key, _MISSING)
+        if value is _MISSING:
+            value = self._compute(full_key, compute, timeout)
+        else:
+            self.shared_hits += 1
+
+        self._local_set(full_key, value)
+        return copy.copy(value)
+
+    def _compute(self, full_key, compute, timeout):
+        # Un hilo por clave en el worker…
+        with self._lock:
+            key_lock = self._key_locks.setdefault(full_key, threading.Lock())
+        with key_lock:
+            try:
+                value = self.shared.get(full_key, _MISSING)
+                if value is not _MISSING:
+                    self.shared_hits += 1
+                    return value
+
+                # …y un worker por clave en el host
+                lock_key = f"{full_key}:lock"
+                if not self.shared.add(lock_key, 1, timeout=self.lock_timeout):
+                    value = self._wait_for(full_key, lock_key)
+                    if value is not _MISSING:
+                        self.shared_hits += 1
+                        return value
+
+                self.misses += 1
+                try:
+                    value = compute()
+                    self.shared.set(
+                        full_key,
+                        value,
+                        timeout=self.timeout if timeout is None else timeout,
+                    )
+                finally:
+                    self.shared.delete(lock_key)
+                return value
+            finally:
+                with self._lock:
+                    self._key_locks.pop(full_key, None)
+
+    def _wait_for(self, full_key, lock_key):
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.01
+        while time.monotonic() < deadline:
+            time.sleep(delay)
+            value = self.shared.get(full_key, _MISSING)
+            if value is not _MISSING:
+                return value
+            if not self.shared.has_key(lock_key):
+                # Terminó sin guardar (error, o el valor no cabe en la caché)
+                break
+            delay = min(delay * 2, 0.2)
+        # Sin valor: calculamos nosotros
+        return _MISSING
+
+    def stats(self):
+        return {
+            "object_cache_local_hits_total": self.local_hits,
+            "object_cache_shared_hits_total": self.shared_hits,
+            "object_cache_misses_total": self.misses,
+            "object_cache_local_entries": len(self._local),
+        }
+
+
+def namespace_for(model):
+    return model._meta.label_lower
+
+
+def cached_object(model, pk, timeout=None):
+    """
+    ``model`` con esa pk desde la caché; ``None`` si no existe (también se
+    cachea, para no repetir la query de un id inexistente).
+    """
+    return object_cache.get_or_compute(
+        namespace_for(model),
+        f"pk:{pk}",
+        lambda: model._default_manager.filter(pk=pk).first(),
+        timeout,
+    )
+
+
+def cached_queryset(queryset, key, timeout=None):
+    """
+    Resultado de ``queryset`` como lista, bajo ``key`` en el namespace del
+    modelo. ``key`` debe identificar el filtro/orden/página del queryset.
+    """
+    return object_cache.get_or_compute(
+        namespace_for(queryset.model), f"qs:{key}", lambda: list(queryset), timeout
+    )
+
+
+def invalidate_model(model):
+    object_cache.invalidate(namespace_for(model))
+
+
+object_cache = ObjectCache(
+    alias=getattr(settings, "OBJECT_CACHE_ALIAS", "default"),
+    maxsize=getattr(settings, "OBJECT_CACHE_LOCAL_SIZE", 1024),
+    local_ttl=getattr(settings, "OBJECT_CACHE_LOCAL_TTL", 5),
+    timeout=getattr(settings, "OBJECT_CACHE_TIMEOUT", 300),
+)
+request_metrics.register_collector(object_cache.stats)
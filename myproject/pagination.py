@@ -0,0 +1,121 @@
+"""
+Conteos estimados para listados paginados.
+
+``COUNT(*)`` en Postgres recorre la tabla (o un índice entero) en cada
+request, aunque solo se pida la página 1. Por encima de
+``PAGINATION_ESTIMATE_THRESHOLD`` filas se usa la estimación del planner:
+
+- queryset sin filtros: ``pg_class.reltuples`` (lo mantiene ANALYZE /
+  autovacuum), una lectura del catálogo;
+- con filtros: las filas estimadas por ``EXPLAIN`` de la misma query.
+
+Si la estimación queda bajo el umbral se cuenta exacto, así los listados
+chicos y los filtros selectivos siguen dando el número real. La respuesta
+indica ``count_approximate`` y ``?count=exact`` fuerza el conteo exacto.
+En otros motores (SQLite en tests) el conteo es siempre exacto.
+"""
+
+import functools
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+EXACT = "exact"
+
+
+def wants_exact_count(request, param):
+    return request.query_params.get(param, "").lower() == EXACT
+
+
+def planner_estimate(queryset):
+    """Filas estimadas por Postgres sin ejecutar la query; ``None`` si no aplica"""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    query = queryset.query
+    if (
+        not query.where
+        and not query.distinct
+        and not query.is_sliced
+        and query.group_by is None
+        and not query.combinator
+    ):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1: tabla nunca analizada (o particionada); se pregunta a EXPLAIN
+        if row and row[0] >= 0:
+            return int(row[0])
+
+    compiler = queryset.order_by().query.get_compiler(using=queryset.db)
+    sql, params = compiler.as_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimated_count(queryset, exact=False, threshold=None):
+    """``(filas, aproximado)`` de ``queryset``"""
+    if threshold is None:
+        threshold = getattr(settings, "PAGINATION_ESTIMATE_THRESHOLD", 0)
+    if not exact and threshold:
+        estimate = planner_estimate(queryset)
+        if estimate is not None and estimate >= threshold:
+            return estimate, True
+    return queryset.count(), False
+
+
+class EstimatedCountPaginator(Paginator):
+    def __init__(self, *args, exact=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact = exact
+        self.approximate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.approximate = estimated_count(self.object_list, exact=self.exact)
+        return count
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    ``PageNumberPagination`` con ``count`` estimado en tablas grandes.
+    Con un conteo aproximado la última página puede quedar vacía o faltar;
+    quien necesite el total real pide ``?count=exact``.
+    """
+
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.django_paginator_class = functools.partial(
+            EstimatedCountPaginator,
+            exact=wants_exact_count(request, self.count_query_param),
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        return Response(
+            {
+                "count": paginator.count,
+                "count_approximate": paginator.approximate,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
@@ -0,0 +1,156 @@
+"""
+Profiler estadístico para requests lentos o muestreados.
+
+Un hilo por worker toma cada ``interval`` segundos el stack de los hilos
+que están atendiendo un request (``sys._current_frames``) y lo acumula en
+formato "collapsed" (``modulo:funcion;modulo:funcion N``). Al terminar el
+request el perfil se guarda solo si el request salió en la muestra
+(``sample_rate``) o superó ``slow_threshold``. Los archivos rotan en
+``directory`` y ``manage.py merge_profiles`` los junta para flamegraph.pl
+o speedscope.
+
+Con ``sample_rate=0`` y ``slow_threshold=0`` no se crea el hilo.
+"""
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class _Session:
+    __slots__ = ("thread_id", "sampled", "stacks")
+
+    def __init__(self, thread_id, sampled):
+        self.thread_id = thread_id
+        self.sampled = sampled
+        self.stacks = Counter()
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        directory,
+        sample_rate=0.0,
+        slow_threshold=0.0,
+        interval=0.005,
+        max_files=200,
+    ):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.interval = interval
+        self.max_files = max_files
+        self.enabled = sample_rate > 0 or slow_threshold > 0
+        self._active = {}
+        self._wakeup = threading.Event()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_sampler(self):
+        # Igual que el access log: el hilo no sobrevive al fork del worker
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._active = {}
+                threading.Thread(
+                    target=self._run, name="request-profiler", daemon=True
+                ).start()
+                self._pid = os.getpid()
+
+    def start(self):
+        """Empieza a muestrear el hilo actual; None si el profiler está apagado"""
+        if not self.enabled:
+            return None
+        self._ensure_sampler()
+        session = _Session(threading.get_ident(), random.random() < self.sample_rate)
+        self._active[session.thread_id] = session
+        self._wakeup.set()
+        return session
+
+    def stop(self, session, label, duration):
+        """Deja de muestrear y guarda el perfil si corresponde"""
+        if session is None:
+            return None
+        self._active.pop(session.thread_id, None)
+        slow = self.slow_threshold and duration >= self.slow_threshold
+        if not (session.sampled or slow) or not session.stacks:
+            return None
+        try:
+            return self._write(session.stacks, label, duration)
+        except OSError as e:
+            # Directorio de solo lectura, disco lleno...: el request no falla
+            logger.warning("No se pudo guardar el perfil en %s: %s", self.directory, e)
+            return None
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            while self._active:
+                self._sample()
+                time.sleep(self.interval)
+
+    def _sample(self):
+        frames = sys._current_frames()
+        for session in list(self._active.values()):
+            frame = frames.get(session.thread_id)
+            if frame is not None:
+                session.stacks[_collapse(frame)] += 1
+
+    def _write(self, stacks, label, duration):
+        os.makedirs(self.directory, exist_ok=True)
+        name = (
+            f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+            f"{int(duration * 1000)}ms-{_UNSAFE.sub('_', label).strip('_')}.folded"
+        )
+        path = os.path.join(self.directory, name)
+        root = label.replace(";", "_").replace(" ", "_")
+        with open(path, "w") as f:
+            for stack, count in stacks.items():
+                f.write(f"{root};{stack} {count}\n")
+        self._rotate()
+        return path
+
+    def _rotate(self):
+        names = sorted(
+            name for name in os.listdir(self.directory) if name.endswith(".folded")
+        )
+        for name in names[: max(len(names) - self.max_files, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+
+def _collapse(frame):
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+request_profiler = SamplingProfiler(
+    directory=getattr(
+        settings,
+        "PROFILE_DIR",
+        os.path.join(settings.BASE_DIR, "logs", "profiles"),
+    ),
+    sample_rate=getattr(settings, "PROFILE_SAMPLE_RATE", 0.0),
+    slow_threshold=getattr(settings, "PROFILE_SLOW_THRESHOLD", 0.0),
+    interval=getattr(settings, "PROFILE_INTERVAL", 0.005),
+    max_files=getattr(settings, "PROFILE_MAX_FILES", 200),
+)
@@ -1,7 +1,8 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import Csv, config
 import sys
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -28,9 +29,11 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # lookups trigram (users.search)
     # Third party
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "django_filters",
     # Apps locales
     "users",
@@ -38,6 +41,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # /health/ y /ready/ responden antes de sesiones, auth y logging
+    "myproject.health.HealthCheckMiddleware",
+    # Lecturas seguras a réplicas; tras escribir, el cliente queda en el primario
+    "myproject.db_router.ReplicaMiddleware",
+    # Deadline por vista: statement_timeout en Postgres y 503 al agotarse
+    "myproject.deadlines.DeadlineMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -83,6 +92,51 @@ DATABASES = {
     }
 }
 
+# 🔥 Conexiones a Postgres: pool de psycopg 3 (DB_POOL=True) o persistentes
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+if DB_POOL:
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "timeout": config("DB_POOL_TIMEOUT", default=10, cast=float),
+            "max_idle": config("DB_POOL_MAX_IDLE", default=300, cast=float),
+            # Verifica cada conexión al sacarla del pool (descarta las caídas)
+            "check": ConnectionPool.check_connection,
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = config(
+        "DB_CONN_MAX_AGE", default=0, cast=int
+    )  # segundos
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# 🔥 Réplicas de lectura: un alias replica_N por host en DB_REPLICA_HOSTS
+DB_REPLICAS = []
+for _index, _host in enumerate(
+    config("DB_REPLICA_HOSTS", default="", cast=Csv()), start=1
+):
+    _alias = f"replica_{_index}"
+    DATABASES[_alias] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        # En tests la réplica es el mismo Postgres de default
+        "TEST": {"MIRROR": "default"},
+    }
+    DB_REPLICAS.append(_alias)
+DATABASE_ROUTERS = ["myproject.db_router.ReplicaRouter"]
+DB_PIN_COOKIE = config("DB_PIN_COOKIE", default="db_primary")
+DB_PIN_SECONDS = config("DB_PIN_SECONDS", default=5, cast=int)  # lag de réplica
+
+# Procesos/hilos de gunicorn por contenedor (para validar max_connections).
+# gunicorn.conf.py lee los mismos valores; WEB_THREADS > 1 (gthread) evita que
+# un login esperando al hashing_pool bloquee el worker entero
+WEB_CONCURRENCY = config("WEB_CONCURRENCY", default=1, cast=int)
+WEB_THREADS = config("WEB_THREADS", default=4, cast=int)
+DB_RESERVED_CONNECTIONS = config("DB_RESERVED_CONNECTIONS", default=5, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,34 +183,180 @@ AUTH_USER_MODEL = "users.User"
 # 🔥 CONFIGURACIÓN DE REST FRAMEWORK
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
-    "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
-    ],
+    # anon + user evaluados en una sola operación de caché
+    "DEFAULT_THROTTLE_CLASSES": ["users.throttles.MultiScopeRateThrottle"],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "20/min",  # 🔒 usuarios no autenticados
         "user": "100/min",  # 🔒 usuarios autenticados
         "login": "5/minute",
     },
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'myproject.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 20
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=12),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.CustomTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.CustomTokenRefreshSerializer",
     # "AUTH_HEADER_TYPES": ("Bearer",),
-    # "ROTATE_REFRESH_TOKENS": True,  # ✅ CLAVE
-    # "BLACKLIST_AFTER_ROTATION": True,  # ✅ CLAVE
+    "ROTATE_REFRESH_TOKENS": True,  # ✅ CLAVE
+    "BLACKLIST_AFTER_ROTATION": True,  # ✅ CLAVE
     # "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
 }
 
+# 🔥 LRU de usuarios por worker para la autenticación JWT
+USER_CACHE_SIZE = config("USER_CACHE_SIZE", default=1024, cast=int)
+USER_CACHE_TTL = config("USER_CACHE_TTL", default=60, cast=int)  # segundos
+
+# Segundos que cada worker retiene las versiones de token por rol
+TOKEN_VERSIONS_LOCAL_TTL = config("TOKEN_VERSIONS_LOCAL_TTL", default=5, cast=int)
+
+# 🔥 Pool de procesos para PBKDF2 (login / cambio de contraseña). Es por worker
+# de gunicorn: por defecto se reparten las CPUs del host entre los workers
+HASHING_POOL_WORKERS = config(
+    "HASHING_POOL_WORKERS",
+    default=max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY),
+    cast=int,
+)
+HASHING_POOL_MAX_PENDING = config("HASHING_POOL_MAX_PENDING", default=32, cast=int)
+HASHING_POOL_TIMEOUT = config("HASHING_POOL_TIMEOUT", default=10, cast=int)
+
+# 🔥 Importación masiva de usuarios: lotes y procesos para PBKDF2
+USER_IMPORT_BATCH_SIZE = config("USER_IMPORT_BATCH_SIZE", default=500, cast=int)
+USER_IMPORT_HASHING_WORKERS = config(
+    "USER_IMPORT_HASHING_WORKERS", default=os.cpu_count() or 1, cast=int
+)
+# Filas por request en /api/users/import/: los hashes (~0.5 s c/u) corren en
+# el propio worker, sin procesos extra, y deben terminar holgadamente antes
+# del timeout de 30 s de gunicorn. Lo más grande va por `manage.py import_users`
+USER_IMPORT_MAX_ROWS = config("USER_IMPORT_MAX_ROWS", default=20, cast=int)
+
+# 🔥 Índice de refresh tokens revocados (bloom + JTIs recientes por worker)
+REVOCATION_BLOOM_CAPACITY = config(
+    "REVOCATION_BLOOM_CAPACITY", default=1_000_000, cast=int
+)
+REVOCATION_RECENT_SIZE = config("REVOCATION_RECENT_SIZE", default=10_000, cast=int)
+REVOCATION_REFRESH_INTERVAL = config(
+    "REVOCATION_REFRESH_INTERVAL", default=300, cast=int
+)  # segundos
+
+# 🔥 CACHÉ: en producción, memoria compartida entre los workers del host
+# (throttles y contadores correctos con N workers de gunicorn, sin Redis)
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default=(
+                "django.core.cache.backends.locmem.LocMemCache"
+                if DEBUG
+                else "myproject.shm_cache.SharedMemoryCache"
+            ),
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="/dev/shm/payo_cache"),
+        "OPTIONS": {
+            "SLOTS": config("CACHE_SLOTS", default=16384, cast=int),
+            "SLOT_SIZE": config("CACHE_SLOT_SIZE", default=512, cast=int),
+        },
+    }
+}
+
+# 🔥 Throttles en su propia tabla: en "default" los contadores (TTL 2×ventana)
+# eran siempre los primeros desalojados frente a claves de días
+CACHES["throttle"] = {
+    "BACKEND": CACHES["default"]["BACKEND"],
+    "LOCATION": config("THROTTLE_CACHE_LOCATION", default="/dev/shm/payo_throttle"),
+    "OPTIONS": {
+        "SLOTS": config("THROTTLE_CACHE_SLOTS", default=16384, cast=int),
+        "SLOT_SIZE": config("THROTTLE_CACHE_SLOT_SIZE", default=256, cast=int),
+    },
+}
+
+# 🔥 Marcadores de JTIs revocados (users.revocation): siempre en memoria
+# compartida, también con DEBUG, para que todos los workers los vean. Sin
+# desalojo: con la tabla llena se rechaza la escritura y se registra un error.
+# Cada rotación de refresh revoca un token; dimensionar con holgura (~2×) para
+# las revocaciones de un REFRESH_TOKEN_LIFETIME.
+CACHES["revocations"] = {
+    "BACKEND": "myproject.shm_cache.SharedMemoryCache",
+    "LOCATION": config(
+        "REVOCATION_CACHE_LOCATION", default="/dev/shm/payo_revocations"
+    ),
+    "OPTIONS": {
+        "SLOTS": config("REVOCATION_CACHE_SLOTS", default=65536, cast=int),
+        "SLOT_SIZE": 128,
+        "EVICT": False,
+    },
+}
+
+# Caché de objetos (users, products): slots más grandes que los de throttles
+CACHES["objects"] = {
+    "BACKEND": CACHES["default"]["BACKEND"],
+    "LOCATION": config("OBJECT_CACHE_LOCATION", default="/dev/shm/payo_objects"),
+    "OPTIONS": {
+        "SLOTS": config("OBJECT_CACHE_SLOTS", default=4096, cast=int),
+        "SLOT_SIZE": config("OBJECT_CACHE_SLOT_SIZE", default=8192, cast=int),
+    },
+}
+
+# 🔥 Caché de objetos en dos niveles (LRU por worker + alias "objects")
+OBJECT_CACHE_ALIAS = "objects"
+OBJECT_CACHE_LOCAL_SIZE = config("OBJECT_CACHE_LOCAL_SIZE", default=1024, cast=int)
+OBJECT_CACHE_LOCAL_TTL = config("OBJECT_CACHE_LOCAL_TTL", default=5, cast=int)
+OBJECT_CACHE_TIMEOUT = config("OBJECT_CACHE_TIMEOUT", default=300, cast=int)
+
+# 🔥 Access log asíncrono: cola acotada + hilo escritor por lotes
+ACCESS_LOG_QUEUE_SIZE = config("ACCESS_LOG_QUEUE_SIZE", default=10000, cast=int)
+ACCESS_LOG_BATCH_SIZE = config("ACCESS_LOG_BATCH_SIZE", default=256, cast=int)
+
+# 🔥 Métricas /metrics (snapshots por worker, sumados al consultar)
+METRICS_DIR = config(
+    "METRICS_DIR", default=os.path.join(tempfile.gettempdir(), "payo_metrics")
+)
+METRICS_DUMP_INTERVAL = config("METRICS_DUMP_INTERVAL", default=5, cast=int)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")  # vacío = /metrics responde 403
+
+# 🔥 Instrumentación SQL por request (Server-Timing + detección de N+1)
+SERVER_TIMING_ENABLED = config("SERVER_TIMING_ENABLED", default=True, cast=bool)
+SQL_REPEAT_THRESHOLD = config("SQL_REPEAT_THRESHOLD", default=5, cast=int)
+
+# 🔥 Presupuesto por request (segundos) si la vista no define ``deadline``
+REQUEST_DEADLINE = config("REQUEST_DEADLINE", default=30, cast=float)  # 0 = sin límite
+
+# 🔥 Listados paginados: desde cuántas filas el count sale del planner
+PAGINATION_ESTIMATE_THRESHOLD = config(
+    "PAGINATION_ESTIMATE_THRESHOLD", default=10000, cast=int
+)  # 0 = siempre exacto
+
+# Filas por bloque en las exportaciones en streaming (/api/users/export/)
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# 🔥 /ready/: snapshot refrescado en segundo plano (BD, caché, migraciones)
+READINESS_INTERVAL = config("READINESS_INTERVAL", default=5, cast=int)
+READINESS_STALE_AFTER = config("READINESS_STALE_AFTER", default=30, cast=int)
+
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 os.makedirs(LOG_DIR, exist_ok=True)
 
+# 🔥 Profiler por muestreo: una fracción de requests + todos los lentos.
+# En docker-compose /app es de solo lectura: se escribe en el volumen de logs
+APP_LOG_VOLUME = "/var/log/app"
+PROFILE_DIR = config(
+    "PROFILE_DIR",
+    default=os.path.join(
+        APP_LOG_VOLUME if os.path.isdir(APP_LOG_VOLUME) else LOG_DIR, "profiles"
+    ),
+)
+PROFILE_SAMPLE_RATE = config("PROFILE_SAMPLE_RATE", default=0.0, cast=float)
+PROFILE_SLOW_THRESHOLD = config(
+    "PROFILE_SLOW_THRESHOLD", default=0.0, cast=float
+)  # segundos, 0 = desactivado
+PROFILE_INTERVAL = config("PROFILE_INTERVAL", default=0.005, cast=float)
+PROFILE_MAX_FILES = config("PROFILE_MAX_FILES", default=200, cast=int)
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -191,6 +391,21 @@ REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].update(
 
 if "pytest" in sys.argv[0]:
     REST_FRAMEWORK["DEFAULT_THROTTLE_CLASSES"] = []
+    HASHING_POOL_WORKERS = 0
+    USER_IMPORT_HASHING_WORKERS = 0
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    CACHES["objects"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "objects",
+    }
+    CACHES["throttle"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "throttle",
+    }
+    CACHES["revocations"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "revocations",
+    }
 
 LOGGING = {
     "version": 1,
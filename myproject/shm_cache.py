@@ -0,0 +1,289 @@
+"""
+Backend de caché compartido entre los workers de un mismo host.
+
+Tabla hash de tamaño fijo sobre un archivo mapeado en memoria (por defecto
+en /dev/shm). Cada slot guarda ``(hash, expira, len_clave, len_valor)`` más
+la clave y el valor serializado. Las escrituras se serializan con ``flock``
+entre procesos y un ``threading.Lock`` entre hilos del mismo proceso, así
+``incr`` y ``update_many`` son atómicos para todo el host.
+
+Con la ventana de sondeo llena se desaloja la entrada que vence antes; con
+``OPTIONS["EVICT"] = False`` la escritura se rechaza (``add`` devuelve
+``False``) y nunca se pierde una clave viva.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_MAGIC = b"PAYOSHM1"
+_HEADER = struct.Struct("<8sII")
+_SLOT = struct.Struct("<QdII")
+_EMPTY = 0.0
+_DELETED = -1.0  # tombstone: libre, pero no corta la secuencia de sondeo
+_NEVER = float("inf")
+
+# Un archivo abierto por (ruta, pid): tras un fork cada worker reabre el suyo
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+class _Table:
+    def __init__(self, path, slots, slot_size):
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.size = _HEADER.size + slots * slot_size
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self.fd).st_size != self.size:
+                os.ftruncate(self.fd, 0)
+                os.ftruncate(self.fd, self.size)
+            self.mm = mmap.mmap(self.fd, self.size)
+            magic, stored_slots, stored_size = _HEADER.unpack_from(self.mm, 0)
+            if (magic, stored_slots, stored_size) != (_MAGIC, slots, slot_size):
+                self.mm[:] = bytes(self.size)
+                _HEADER.pack_into(self.mm, 0, _MAGIC, slots, slot_size)
+        finally:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    @contextmanager
+    def locked(self, exclusive=True):
+        with self.lock:
+            fcntl.flock(self.fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+
+def _get_table(path, slots, slot_size):
+    key = (path, os.getpid())
+    table = _tables.get(key)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(key)
+            if table is None:
+                table = _tables[key] = _Table(path, slots, slot_size)
+    return table
+
+
+class SharedMemoryCache(BaseCache):
+    max_probes = 16
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self._path = location or "/dev/shm/payo_cache"
+        self._slots = int(options.get("SLOTS", 16384))
+        self._slot_size = int(options.get("SLOT_SIZE", 512))
+        self._evict = bool(options.get("EVICT", True))
+
+    @property
+    def _table(self):
+        return _get_table(self._path, self._slots, self._slot_size)
+
+    # --- acceso a slots (siempre con el lock tomado) ---
+
+    def _offset(self, index):
+        return _HEADER.size + index * self._slot_size
+
+    def _hash(self, key_bytes):
+        return int.from_bytes(
+            hashlib.blake2b(key_bytes, digest_size=8).digest(), "little"
+        )
+
+    def _find(self, key_bytes, now):
+        """Devuelve ``(slot_de_la_clave, slot_libre_o_a_desalojar)``"""
+        mm = self._table.mm
+        key_hash = self._hash(key_bytes)
+        victim, victim_expires = None, _NEVER
+        for probe in range(self.max_probes):
+            index = (key_hash + probe) % self._slots
+            offset = self._offset(index)
+            slot_hash, expires, key_len, _ = _SLOT.unpack_from(mm, offset)
+            if expires == _EMPTY or expires <= now:
+                if victim_expires != _EMPTY:
+                    victim, victim_expires = index, _EMPTY
+                if expires == _EMPTY:
+                    break
+                continue
+            start = offset + _SLOT.size
+            end = start + key_len
+            if slot_hash == key_hash and mm[start:end] == key_bytes:
+                return index, None
+            if self._evict and (victim is None or expires < victim_expires):
+                victim, victim_expires = index, expires
+        return None, victim
+
+    def _read(self, index):
+        mm = self._table.mm
+        offset = self._offset(index)
+        _, _, key_len, value_len = _SLOT.unpack_from(mm, offset)
+        start = offset + _SLOT.size + key_len
+        end = start + value_len
+        return pickle.loads(mm[start:end])
+
+    def _write(self, index, key_bytes, value, expires):
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if _SLOT.size + len(key_bytes) + len(payload) > self._slot_size:
+            return False
+        mm = self._table.mm
+        offset = self._offset(index)
+        _SLOT.pack_into(
+            mm, offset, self._hash(key_bytes), expires, len(key_bytes), len(payload)
+        )
+        start = offset + _SLOT.size
+        middle = start + len(key_bytes)
+        end = middle + len(payload)
+        mm[start:middle] = key_bytes
+        mm[middle:end] = payload
+        return True
+
+    def _clear_slot(self, index):
+        _SLOT.pack_into(self._table.mm, self._offset(index), 0, _DELETED, 0, 0)
+
+    def _expires(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return _NEVER if expires is None else expires
+
+    def _get(self, key_bytes, default, now):
+        index, _ = self._find(key_bytes, now)
+        return default if index is None else self._read(index)
+
+    def _set(self, key_bytes, value, timeout, now):
+        index, free = self._find(key_bytes, now)
+        target = index if index is not None else free
+        if target is None:
+            return False
+        expires = self._expires(timeout)
+        if expires <= now:
+            if index is not None:
+                self._clear_slot(index)
+            return False
+        if self._write(target, key_bytes, value, expires):
+            return True
+        if index is not None:
+            # El valor nuevo no cabe: el anterior no debe seguir visible
+            self._clear_slot(index)
+        return False
+
+    def _key(self, key, version):
+        return self.make_and_validate_key(key, version=version).encode()
+
+    # --- API de BaseCache ---
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked():
+            now = time.time()
+            if self._find(key_bytes, now)[0] is not None:
+                return False
+            return self._set(key_bytes, value, timeout, now)
+
+    def get(self, key, default=None, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked(exclusive=False):
+            return self._get(key_bytes, default, time.time())
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked():
+            self._set(key_bytes, value, timeout, time.time())
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked():
+            now = time.time()
+            index, _ = self._find(key_bytes, now)
+            if index is None:
+                return False
+            return self._write(
+                index, key_bytes, self._read(index), self._expires(timeout)
+            )
+
+    def delete(self, key, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked():
+            index, _ = self._find(key_bytes, time.time())
+            if index is None:
+                return False
+            self._clear_slot(index)
+            return True
+
+    def has_key(self, key, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked(exclusive=False):
+            return self._find(key_bytes, time.time())[0] is not None
+
+    def incr(self, key, delta=1, version=None):
+        key_bytes = self._key(key, version)
+        with self._table.locked():
+            index, _ = self._find(key_bytes, time.time())
+            if index is None:
+                raise ValueError("Key '%s' not found" % key)
+            mm = self._table.mm
+            expires = _SLOT.unpack_from(mm, self._offset(index))[1]
+            value = self._read(index) + delta
+            self._write(index, key_bytes, value, expires)
+            return value
+
+    def get_many(self, keys, version=None):
+        pairs = [(key, self._key(key, version)) for key in keys]
+        missing = object()
+        with self._table.locked(exclusive=False):
+            now = time.time()
+            values = {
+                key: self._get(key_bytes, missing, now) for key, key_bytes in pairs
+            }
+        return {key: value for key, value in values.items() if value is not missing}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        pairs = [(key, self._key(key, version), value) for key, value in data.items()]
+        failed = []
+        with self._table.locked():
+            now = time.time()
+            for key, key_bytes, value in pairs:
+                if not self._set(key_bytes, value, timeout, now):
+                    failed.append(key)
+        return failed
+
+    def update_many(self, keys, func, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Lectura-modificación-escritura atómica sobre varias claves.
+
+        ``func`` recibe ``{clave: valor}`` con las claves existentes y devuelve
+        ``(resultado, {clave: nuevo_valor})``; se escriben solo esas claves.
+        """
+        pairs = {key: self._key(key, version) for key in keys}
+        missing = object()
+        with self._table.locked():
+            now = time.time()
+            current = {
+                key: self._get(key_bytes, missing, now)
+                for key, key_bytes in pairs.items()
+            }
+            result, updates = func(
+                {key: value for key, value in current.items() if value is not missing}
+            )
+            for key, value in updates.items():
+                self._set(pairs[key], value, timeout, now)
+        return result
+
+    def clear(self):
+        table = self._table
+        with table.locked():
+            header, size = _HEADER.size, table.size
+            table.mm[header:size] = bytes(size - header)
@@ -0,0 +1,91 @@
+"""
+Instrumentación SQL por request.
+
+``RequestLoggingMiddleware`` activa un ``QueryStats`` en una ContextVar
+mientras atiende el request; el ``execute_wrapper`` instalado en cada
+conexión lo consulta y acumula número de queries, tiempo en BD y cuántas
+veces se repite cada forma de query (mismo SQL, distintos parámetros),
+que es la firma de un N+1.
+
+Se usa una ContextVar y no un ``execute_wrapper`` dentro de un ``with``
+porque bajo ASGI la vista corre en otro hilo (``sync_to_async``) con su
+propia conexión; el contexto sí viaja a ese hilo.
+"""
+
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+_current = ContextVar("sql_stats", default=None)
+
+# "IN (%s, %s, %s)" y "IN (%s)" son la misma forma
+_PLACEHOLDERS = re.compile(r"%s(?:\s*,\s*%s)+")
+
+
+class QueryStats:
+    def __init__(self, repeat_threshold=5):
+        self.repeat_threshold = repeat_threshold
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def add(self, sql, duration):
+        self.count += 1
+        self.duration += duration
+        self.shapes[_PLACEHOLDERS.sub("%s", sql)] += 1
+
+    def repeated(self):
+        """``(veces, sql)`` de la forma más repetida si supera el umbral"""
+        if not self.shapes:
+            return None
+        sql, times = self.shapes.most_common(1)[0]
+        if times < self.repeat_threshold:
+            return None
+        return times, sql
+
+    def server_timing(self, total):
+        db = self.duration * 1000
+        app = max(total * 1000 - db, 0)
+        return (
+            f'db;dur={db:.1f};desc="{self.count} queries", '
+            f"app;dur={app:.1f}, total;dur={total * 1000:.1f}"
+        )
+
+
+def start():
+    """Activa un ``QueryStats`` nuevo para el contexto actual"""
+    stats = QueryStats(getattr(settings, "SQL_REPEAT_THRESHOLD", 5))
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def _execute_wrapper(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    start_time = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add(sql, time.perf_counter() - start_time)
+
+
+def install(connection, **kwargs):
+    if _execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_execute_wrapper)
+
+
+connection_created.connect(install, dispatch_uid="sql_stats_install")
+
+# Conexiones ya abiertas antes de importar el módulo (shell, tests)
+for _connection in connections.all(initialized_only=True):
+    install(_connection)
@@ -1,5 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
+
+from .views import metrics
 # from rest_framework_simplejwt.views import (
 #     TokenObtainPairView,
 #     TokenRefreshView,
@@ -8,7 +10,8 @@ from django.urls import path, include
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    # path("api/", include("users.urls")),
+    path("api/", include("users.urls")),
+    path("metrics", metrics, name="metrics"),
     # path('api/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     # path("api/login/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     # path("api/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
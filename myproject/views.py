@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from .metrics import request_metrics
+
+
+def metrics(request):
+    """Métricas en formato de texto de Prometheus"""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    # Sin token configurado no se exponen: cerrado por defecto
+    if not token or request.headers.get("Authorization") != f"Bearer {token}":
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        request_metrics.render(), content_type="text/plain; version=0.0.4"
+    )
@@ -1,10 +1,15 @@
 # conftest.py
 
+import logging
+import os
+
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
+from django.core.cache import cache, caches
 from factories import AdminFactory, StaffFactory, UserFactory
+from myproject.health import readiness_probe
+from myproject.object_cache import object_cache
 
 User = get_user_model()
 
@@ -12,6 +17,16 @@ User = get_user_model()
 @pytest.fixture(autouse=True)
 def clear_throttle_cache():
     cache.clear()
+    caches["objects"].clear()
+    caches["throttle"].clear()
+    caches["revocations"].clear()
+    object_cache.clear_local()
+
+
+@pytest.fixture(autouse=True)
+def no_readiness_thread(monkeypatch):
+    # El middleware arranca el hilo de /ready/; en tests no debe tocar la BD
+    monkeypatch.setattr(readiness_probe, "_pid", os.getpid())
 
 
 @pytest.fixture(autouse=True)
@@ -55,3 +70,33 @@ def get_token(api_client):
         return response.data["access"]
 
     return _get_token
+
+
+@pytest.fixture
+def auth_client(api_client, admin_user, get_token):
+    """APIClient autenticado como administrador"""
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(admin_user)}")
+    return api_client
+
+
+@pytest.fixture
+def user_client(api_client, client_user, get_token):
+    """APIClient autenticado como usuario cliente"""
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(client_user)}")
+    return api_client
+
+
+@pytest.fixture
+def captured_messages():
+    """Mensajes emitidos al logger django.request (access log)"""
+    messages = []
+
+    class TestHandler(logging.Handler):
+        def emit(self, record):
+            messages.append(record.getMessage())
+
+    handler = TestHandler()
+    request_logger = logging.getLogger("django.request")
+    request_logger.addHandler(handler)
+    yield messages
+    request_logger.removeHandler(handler)
@@ -0,0 +1,48 @@
+import os
+
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory
+from myproject.access_log import AccessLogQueue, access_log
+from myproject.middleware import RequestLoggingMiddleware
+
+
+class TestAccessLogQueue:
+    """Tests for myproject/access_log.py"""
+
+    def test_records_are_written_by_background_thread(self, captured_messages):
+        log = AccessLogQueue(maxsize=100, batch_size=10)
+
+        for i in range(25):
+            log.put(
+                ("GET", f"/api/{i}/", 200, "Anonymous", "127.0.0.1", 0.001, 0, 0, None)
+            )
+        log.flush()
+
+        assert log.stats()["written"] == 25
+        assert "GET /api/0/ | status=200" in captured_messages[0]
+
+    def test_full_queue_drops_instead_of_blocking(self, captured_messages):
+        log = AccessLogQueue(maxsize=2)
+        # Sin hilo escritor: la cola se llena y no se vacía
+        log._pid = os.getpid()
+
+        for _ in range(5):
+            log.put(("GET", "/", 200, "Anonymous", "127.0.0.1", 0.001, 0, 0, None))
+
+        assert log.stats() == {"queued": 2, "written": 0, "dropped": 3}
+
+
+def test_middleware_enqueues_access_log(captured_messages):
+    request = RequestFactory().get("/api/protected/", REMOTE_ADDR="10.0.0.1")
+    request.user = AnonymousUser()
+    middleware = RequestLoggingMiddleware(lambda request: HttpResponse(status=204))
+
+    response = middleware(request)
+    access_log.flush()
+
+    assert response.status_code == 204
+    assert any(
+        "GET /api/protected/ | status=204 | user=Anonymous | ip=10.0.0.1" in message
+        for message in captured_messages
+    )
@@ -0,0 +1,96 @@
+import pytest
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from users.authentication import CachedJWTAuthentication
+from users.serializers import CustomTokenObtainPairSerializer
+from users.user_cache import UserLRUCache, user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+    yield
+    user_cache.clear()
+
+
+def _access_token(user):
+    return CustomTokenObtainPairSerializer.get_token(user).access_token
+
+
+def _authenticate(token):
+    request = APIRequestFactory().get(
+        "/api/protected/", HTTP_AUTHORIZATION=f"Bearer {token}"
+    )
+    return CachedJWTAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Tests for users/authentication.py"""
+
+    def test_token_contains_role_claims(self, client_user):
+        token = _access_token(client_user)
+        assert token["role"] == client_user.role
+        assert token["is_active"] is True
+        assert token["ver"] == client_user.token_version
+
+    def test_second_request_does_not_query_users_table(
+        self, client_user, django_assert_num_queries
+    ):
+        token = _access_token(client_user)
+
+        with django_assert_num_queries(1):
+            _authenticate(token)
+
+        with django_assert_num_queries(0):
+            user, _ = _authenticate(token)
+
+        assert user.pk == client_user.pk
+        assert user.role == client_user.role
+
+    def test_save_invalidates_cached_user(self, client_user):
+        _authenticate(_access_token(client_user))
+        assert user_cache.get(client_user.pk) is not None
+
+        client_user.first_name = "Nuevo"
+        client_user.save()
+
+        assert user_cache.get(client_user.pk) is None
+
+    def test_save_in_another_worker_invalidates_cached_user(self, client_user):
+        _authenticate(_access_token(client_user))
+        # El LRU de otro worker no se toca: solo la versión compartida
+        UserLRUCache(ttl=60).invalidate(client_user.pk)
+
+        assert user_cache.get(client_user.pk) is None
+
+    def test_outdated_token_version_is_rejected(self, client_user):
+        token = _access_token(client_user)
+        client_user.token_version += 1
+        client_user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            _authenticate(token)
+
+    def test_inactive_claim_is_rejected_without_query(
+        self, client_user, django_assert_num_queries
+    ):
+        client_user.is_active = False
+        client_user.save()
+        token = _access_token(client_user)
+
+        with django_assert_num_queries(0):
+            with pytest.raises(AuthenticationFailed):
+                _authenticate(token)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = UserLRUCache(maxsize=2, ttl=60)
+    cache.set(1, object())
+    cache.set(2, object())
+    cache.get(1)
+    cache.set(3, object())
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert len(cache) == 2
@@ -0,0 +1,86 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from factories import UserFactory
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    def test_me_returns_304_when_unchanged(self, user_client, client_user):
+        first = user_client.get("/api/users/me/")
+        assert first.status_code == 200
+        assert first.data["username"] == client_user.username
+
+        second = user_client.get("/api/users/me/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_me_etag_changes_after_save(self, user_client, client_user):
+        etag = user_client.get("/api/users/me/")["ETag"]
+
+        client_user.first_name = "Nuevo"
+        client_user.save()
+        response = user_client.get("/api/users/me/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response.data["first_name"] == "Nuevo"
+        assert response["ETag"] != etag
+
+    def test_retrieve_sends_last_modified(self, user_client):
+        other = UserFactory()
+
+        response = user_client.get(f"/api/users/{other.id}/")
+        again = user_client.get(
+            f"/api/users/{other.id}/",
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+
+        assert again.status_code == 304
+
+    def test_etag_depends_on_fields(self, user_client, client_user):
+        full = user_client.get(f"/api/users/{client_user.id}/")["ETag"]
+        sparse = user_client.get(f"/api/users/{client_user.id}/?fields=id")["ETag"]
+
+        assert full != sparse
+
+    def test_list_304_costs_no_table_query(self, user_client):
+        etag = user_client.get("/api/users/")["ETag"]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get("/api/users/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert not any("users_user" in q["sql"] for q in queries.captured_queries)
+
+    def test_list_etag_changes_on_write(self, user_client):
+        etag = user_client.get("/api/users/")["ETag"]
+
+        UserFactory()
+        response = user_client.get("/api/users/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_missing_user_is_still_404(self, user_client):
+        assert user_client.get("/api/users/999999/").status_code == 404
+
+    def test_warm_detail_and_me_cost_no_table_query(self, user_client, client_user):
+        user_client.get(f"/api/users/{client_user.pk}/")
+        user_client.get("/api/users/me/")
+
+        with CaptureQueriesContext(connection) as queries:
+            detail = user_client.get(f"/api/users/{client_user.pk}/")
+            me = user_client.get("/api/users/me/")
+
+        assert detail.status_code == me.status_code == 200
+        assert detail.data["username"] == client_user.username
+        assert not any("users_user" in q["sql"] for q in queries.captured_queries)
+
+    def test_detail_reflects_saves(self, user_client, client_user):
+        user_client.get(f"/api/users/{client_user.pk}/")
+        client_user.first_name = "Nuevo"
+        client_user.save()
+
+        response = user_client.get(f"/api/users/{client_user.pk}/")
+
+        assert response.data["first_name"] == "Nuevo"
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+
+from myproject import checks, metrics
+
+
+class FakePool:
+    def get_stats(self):
+        return {"pool_size": 4, "pool_available": 3, "requests_num": 10}
+
+
+class FakeConnection:
+    vendor = "postgresql"
+
+    def __init__(self, options, max_connections=100):
+        self.settings_dict = {"OPTIONS": options}
+        self.max_connections = max_connections
+        self.pool = FakePool() if options.get("pool") else None
+
+    @contextmanager
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def execute(self, sql):
+                assert sql == "SHOW max_connections"
+
+            def fetchone(self):
+                return (str(connection.max_connections),)
+
+        yield Cursor()
+
+
+def test_pool_stats_are_exported_as_gauges_and_counters(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        metrics, "connections", {"default": FakeConnection({"pool": True})}
+    )
+    request_metrics = metrics.RequestMetrics(str(tmp_path))
+    request_metrics.register_collector(metrics.db_pool_stats)
+
+    text = request_metrics.render()
+
+    assert "# TYPE db_pool_pool_size gauge\ndb_pool_pool_size 4" in text
+    assert "# TYPE db_pool_requests_num_total counter" in text
+
+
+def test_check_fails_when_workers_exceed_max_connections(monkeypatch, settings):
+    settings.WEB_CONCURRENCY = 12
+    settings.DB_RESERVED_CONNECTIONS = 5
+    monkeypatch.setattr(
+        checks,
+        "connections",
+        {"default": FakeConnection({"pool": {"max_size": 10}}, max_connections=100)},
+    )
+
+    errors = checks.check_connection_budget(None, databases=["default"])
+
+    assert [error.id for error in errors] == ["myproject.E001"]
+    assert "12 workers × 10 conexiones = 120" in errors[0].msg
+
+
+def test_check_passes_within_budget(monkeypatch, settings):
+    settings.WEB_CONCURRENCY = 4
+    settings.WEB_THREADS = 2
+    monkeypatch.setattr(
+        checks, "connections", {"default": FakeConnection({}, max_connections=100)}
+    )
+
+    assert checks.check_connection_budget(None, databases=["default"]) == []
+    # Sin --database el check no consulta el servidor
+    assert checks.check_connection_budget(None) == []
@@ -0,0 +1,71 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from myproject.db_router import ReplicaMiddleware, ReplicaRouter
+from users.models import User
+
+router = ReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DB_REPLICAS = ["replica_1", "replica_2"]
+    settings.DB_PIN_COOKIE = "db_primary"
+    settings.DB_PIN_SECONDS = 5
+    return settings.DB_REPLICAS
+
+
+def run(request, view):
+    """Pasa ``request`` por ReplicaMiddleware y devuelve (respuesta, alias leídos)"""
+    reads = []
+
+    def get_response(request):
+        reads.append(view())
+        return HttpResponse()
+
+    response = ReplicaMiddleware(get_response)(request)
+    return response, reads[0]
+
+
+def test_safe_reads_are_spread_over_replicas(replicas):
+    request = RequestFactory().get("/api/users/")
+
+    aliases = {run(request, lambda: router.db_for_read(User))[1] for _ in range(4)}
+
+    assert aliases == {"replica_1", "replica_2"}
+
+
+def test_write_pins_the_client_to_the_primary(replicas):
+    def write_then_read():
+        assert router.db_for_write(User) == "default"
+        return router.db_for_read(User)
+
+    response, alias = run(RequestFactory().get("/api/users/"), write_then_read)
+
+    assert alias == "default"
+    cookie = response.cookies["db_primary"]
+    assert cookie["max-age"] == 5
+    assert cookie["httponly"]
+
+
+def test_pinned_client_reads_from_primary(replicas):
+    request = RequestFactory().get("/api/users/")
+    request.COOKIES["db_primary"] = "1"
+
+    response, alias = run(request, lambda: router.db_for_read(User))
+
+    assert alias == "default"
+    assert "db_primary" not in response.cookies
+
+
+def test_unsafe_methods_and_requestless_code_use_primary(replicas):
+    request = RequestFactory().post("/api/users/")
+    _, alias = run(request, lambda: router.db_for_read(User))
+
+    assert alias == "default"
+    assert router.db_for_read(User) == "default"
+
+
+def test_replicas_are_not_migrated(replicas):
+    assert router.allow_migrate("default", "users") is True
+    assert router.allow_migrate("replica_1", "users") is False
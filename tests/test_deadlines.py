@@ -0,0 +1,126 @@
+import time
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from factories import UserFactory
+from myproject.deadlines import (
+    DeadlineExceeded,
+    DeadlineMiddleware,
+    deadline,
+    view_deadline,
+)
+from rest_framework.views import APIView
+
+from users.models import User
+
+postgres_only = pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="statement_timeout de Postgres"
+)
+
+
+def run_view(view, body):
+    """Pasa un request por DeadlineMiddleware y ejecuta ``body`` como la vista"""
+    results = []
+
+    def get_response(request):
+        response = middleware.process_view(request, view, (), {})
+        if response is not None:
+            return response
+        try:
+            results.append(body())
+        except DeadlineExceeded as e:
+            return middleware.process_exception(request, e)
+        return HttpResponse()
+
+    middleware = DeadlineMiddleware(get_response)
+    response = middleware(RequestFactory().get("/api/users/"))
+    return response, results
+
+
+def show_statement_timeout():
+    with connection.cursor() as cursor:
+        cursor.execute("SHOW statement_timeout")
+        return cursor.fetchone()[0]
+
+
+class TestViewDeadline:
+    def test_decorated_function(self, settings):
+        settings.REQUEST_DEADLINE = 30
+
+        @deadline(2)
+        def view(request):
+            return HttpResponse()
+
+        assert view_deadline(view) == 2
+
+    def test_drf_class_attribute(self, settings):
+        settings.REQUEST_DEADLINE = 30
+
+        class SlowView(APIView):
+            deadline = 5
+
+        assert view_deadline(SlowView.as_view()) == 5
+        assert view_deadline(APIView.as_view()) == 30
+
+
+@pytest.mark.django_db
+def test_exhausted_budget_returns_503_without_querying():
+    @deadline(0.001)
+    def view(request):
+        pass
+
+    def body():
+        time.sleep(0.01)
+        return show_statement_timeout()
+
+    response, results = run_view(view, body)
+
+    assert response.status_code == 503
+    assert results == []
+
+
+@postgres_only
+@pytest.mark.django_db
+def test_statement_timeout_follows_the_view_budget(settings):
+    settings.REQUEST_DEADLINE = 0
+
+    response, results = run_view(
+        deadline(5)(lambda request: None), show_statement_timeout
+    )
+    assert response.status_code == 200
+    assert results == ["5s"]
+
+    # El siguiente request sin presupuesto no hereda el timeout de la sesión
+    _, results = run_view(lambda request: None, show_statement_timeout)
+    assert results == ["0"]
+
+
+@postgres_only
+@pytest.mark.django_db
+def test_cancelled_query_becomes_503():
+    def body():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_sleep(2)")
+
+    response, results = run_view(deadline(0.2)(lambda request: None), body)
+
+    assert response.status_code == 503
+    assert results == []
+
+
+@postgres_only
+@pytest.mark.django_db
+def test_chunked_iterator_uses_a_server_side_cursor_safely():
+    # .iterator() usa un cursor con nombre: el SET no puede ir por él
+    UserFactory.create_batch(3)
+
+    def body():
+        users = User.objects.values_list("pk", flat=True)
+        return list(users.iterator(chunk_size=2))
+
+    response, results = run_view(deadline(5)(lambda request: None), body)
+
+    assert response.status_code == 200
+    assert len(results[0]) == 3
@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from factories import UserFactory
+from rest_framework.request import Request
+
+from myproject.pagination import (
+    EstimatedCountPagination,
+    estimated_count,
+    planner_estimate,
+)
+from users.models import User
+
+
+@pytest.fixture
+def big_table(monkeypatch, settings):
+    """Simula una tabla grande: el planner estima 50 000 filas"""
+    settings.PAGINATION_ESTIMATE_THRESHOLD = 1000
+    monkeypatch.setattr("myproject.pagination.planner_estimate", lambda qs: 50000)
+
+
+@pytest.mark.django_db
+class TestEstimatedCount:
+    def test_small_estimate_falls_back_to_exact(self, monkeypatch):
+        UserFactory.create_batch(3)
+        monkeypatch.setattr("myproject.pagination.planner_estimate", lambda qs: 7)
+
+        assert estimated_count(User.objects.all(), threshold=1000) == (3, False)
+
+    def test_large_estimate_is_returned_as_approximate(self, big_table):
+        assert estimated_count(User.objects.all()) == (50000, True)
+        assert estimated_count(User.objects.all(), exact=True)[1] is False
+
+    def test_keyset_listing_marks_count_as_approximate(self, auth_client, big_table):
+        body = auth_client.get("/api/users/").json()
+        exact = auth_client.get("/api/users/?count=exact").json()
+
+        assert (body["count"], body["count_approximate"]) == (50000, True)
+        assert exact["count"] == User.objects.count()
+        assert exact["count_approximate"] is False
+
+    def test_page_number_pagination(self, big_table):
+        UserFactory.create_batch(3)
+        paginator = EstimatedCountPagination()
+        request = Request(RequestFactory().get("/"))
+
+        page = paginator.paginate_queryset(User.objects.order_by("id"), request)
+        body = paginator.get_paginated_response(page).data
+
+        assert body["count"] == 50000
+        assert body["count_approximate"] is True
+        assert len(body["results"]) == 3
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="estimaciones del planner de Postgres"
+    )
+    def test_planner_estimate_on_postgres(self):
+        UserFactory.create_batch(5)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE users_user")
+
+        assert planner_estimate(User.objects.all()) == 5
+        assert planner_estimate(User.objects.filter(role="COORDINADOR")) >= 0
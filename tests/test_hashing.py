@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.signals import user_login_failed
+from users.hashing import HashingPoolSaturated, PasswordHashingPool, hashing_pool
+
+
+class TestPasswordHashingPool:
+    """Tests for users/hashing.py"""
+
+    def test_inline_check_password(self):
+        pool = PasswordHashingPool(max_workers=0)
+        encoded = make_password("secreto123")
+
+        assert pool.check_password("secreto123", encoded) is True
+        assert pool.check_password("otra", encoded) is False
+
+    def test_unknown_user_is_rejected(self):
+        pool = PasswordHashingPool(max_workers=0)
+        assert pool.check_password("secreto123", None) is False
+
+    def test_process_pool_check_password(self):
+        pool = PasswordHashingPool(max_workers=1)
+        try:
+            encoded = pool.make_password("secreto123")
+            assert pool.check_password("secreto123", encoded) is True
+        finally:
+            pool.shutdown()
+
+    def test_async_check_password(self):
+        pool = PasswordHashingPool(max_workers=0)
+        encoded = make_password("secreto123")
+
+        assert asyncio.run(pool.acheck_password("secreto123", encoded)) is True
+
+    def test_async_process_pool_check_password(self):
+        pool = PasswordHashingPool(max_workers=1)
+        try:
+            encoded = asyncio.run(pool.amake_password("secreto123"))
+            assert asyncio.run(pool.acheck_password("secreto123", encoded)) is True
+        finally:
+            pool.shutdown()
+
+    def test_saturated_pool_fails_fast(self):
+        pool = PasswordHashingPool(max_workers=0, max_pending=1)
+        pool._slots.acquire()
+
+        with pytest.raises(HashingPoolSaturated):
+            pool.check_password("secreto123", make_password("secreto123"))
+
+
+class RejectAllBackend:
+    def authenticate(self, request, **credentials):
+        return None
+
+
+@pytest.mark.django_db
+class TestLoginWithHashingPool:
+    def test_login_returns_tokens(self, api_client, client_user):
+        response = api_client.post(
+            "/api/login/",
+            {"username": client_user.username, "password": "123456"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert "access" in response.data
+        assert "refresh" in response.data
+
+    def test_login_wrong_password(self, api_client, client_user):
+        response = api_client.post(
+            "/api/login/",
+            {"username": client_user.username, "password": "incorrecta"},
+            format="json",
+        )
+
+        assert response.status_code == 401
+
+    def test_login_returns_503_when_saturated(
+        self, api_client, client_user, monkeypatch
+    ):
+        def saturated(*args, **kwargs):
+            raise HashingPoolSaturated()
+
+        monkeypatch.setattr(hashing_pool, "check_password", saturated)
+
+        response = api_client.post(
+            "/api/login/",
+            {"username": client_user.username, "password": "123456"},
+            format="json",
+        )
+
+        assert response.status_code == 503
+
+    def test_failed_login_sends_user_login_failed(self, api_client, client_user):
+        received = []
+
+        def receiver(sender, credentials, **kwargs):
+            received.append(credentials)
+
+        user_login_failed.connect(receiver)
+        try:
+            api_client.post(
+                "/api/login/",
+                {"username": client_user.username, "password": "incorrecta"},
+                format="json",
+            )
+        finally:
+            user_login_failed.disconnect(receiver)
+
+        assert received == [
+            {"username": client_user.username, "password": "********************"}
+        ]
+
+    def test_login_rehashes_when_preferred_hasher_changed(
+        self, api_client, client_user, settings
+    ):
+        settings.PASSWORD_HASHERS = [
+            "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ]
+        client_user.password = make_password("123456", hasher="md5")
+        client_user.save(update_fields=["password"])
+
+        response = api_client.post(
+            "/api/login/",
+            {"username": client_user.username, "password": "123456"},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        client_user.refresh_from_db()
+        assert client_user.password.startswith("pbkdf2_sha256$")
+
+    def test_login_uses_authenticate_with_other_backends(
+        self, api_client, client_user, settings
+    ):
+        settings.AUTHENTICATION_BACKENDS = ["tests.test_hashing.RejectAllBackend"]
+
+        response = api_client.post(
+            "/api/login/",
+            {"username": client_user.username, "password": "123456"},
+            format="json",
+        )
+
+        assert response.status_code == 401
+
+    def test_change_password(self, api_client, client_user, get_token):
+        token = get_token(client_user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.post(
+            "/api/users/change_password/",
+            {
+                "old_password": "123456",
+                "new_password": "nueva_contraseña_segura_123",
+                "new_password_confirm": "nueva_contraseña_segura_123",
+            },
+            format="json",
+        )
+
+        assert response.status_code == 200
+        client_user.refresh_from_db()
+        assert client_user.check_password("nueva_contraseña_segura_123")
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test.utils import CaptureQueriesContext
+from myproject.health import HealthCheckMiddleware, ReadinessProbe, readiness_probe
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    # Sin hilo de fondo (ver conftest): los tests refrescan el snapshot a mano
+    monkeypatch.setattr(readiness_probe, "snapshot", None)
+    return readiness_probe
+
+
+def test_health_short_circuits_the_middleware_stack(api_client, captured_messages):
+    # Sin django_db: cualquier query (sesión, usuario) haría fallar el test
+    response = api_client.get("/health/")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert "Server-Timing" not in response
+    assert captured_messages == []
+
+
+@pytest.mark.django_db
+def test_ready_serves_snapshot_without_touching_the_db(api_client, probe):
+    probe.refresh()
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/ready/")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["ready"] is True
+    assert set(body["checks"]) == {"database", "cache", "migrations"}
+    assert len(queries) == 0
+
+
+def test_ready_is_503_until_first_snapshot(api_client, probe):
+    response = api_client.get("/ready/")
+
+    assert response.status_code == 503
+
+
+def test_middleware_starts_the_probe_thread(monkeypatch):
+    started = []
+    monkeypatch.setattr(readiness_probe, "start", lambda: started.append(1))
+
+    HealthCheckMiddleware(lambda request: None)
+
+    assert started == [1]
+
+
+class TestReadinessProbe:
+    """Tests for myproject/health.py"""
+
+    def test_failed_check_marks_not_ready(self, monkeypatch):
+        probe = ReadinessProbe()
+
+        def broken_cache():
+            raise RuntimeError("caché caída")
+
+        monkeypatch.setattr(probe, "_check_database", lambda: {})
+        monkeypatch.setattr(probe, "_check_migrations", lambda: {})
+        monkeypatch.setattr(probe, "_check_cache", broken_cache)
+        probe._pid = os.getpid()
+
+        probe.refresh()
+        status, body = probe.status()
+
+        assert status == 503
+        assert body["checks"]["cache"] == {
+            "ok": False,
+            "error": "caché caída",
+            "latency_ms": body["checks"]["cache"]["latency_ms"],
+        }
+
+    def test_stale_snapshot_is_not_ready(self):
+        probe = ReadinessProbe(stale_after=30)
+        probe._pid = os.getpid()
+        probe.snapshot = {"ready": True, "checked_at": time.time() - 60, "checks": {}}
+
+        status, body = probe.status()
+
+        assert status == 503
+        assert body["error"] == "snapshot vencido"
+
+    def test_background_thread_closes_its_connection(self, monkeypatch):
+        probe = ReadinessProbe(interval=0.01)
+        backend = type(connections[DEFAULT_DB_ALIAS])
+        closed = []
+        monkeypatch.setattr(
+            backend, "close", lambda self: closed.append(threading.get_ident())
+        )
+        rounds = []
+
+        def refresh():
+            rounds.append(1)
+            if len(rounds) == 2:
+                probe.stop()
+
+        monkeypatch.setattr(probe, "refresh", refresh)
+        thread = threading.Thread(target=probe._run)
+        thread.start()
+        thread.join(timeout=5)
+
+        # Una vez por vuelta, en el hilo del probe
+        assert closed == [thread.ident, thread.ident]
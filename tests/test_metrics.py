@@ -0,0 +1,103 @@
+import json
+import os
+import time
+
+import pytest
+from myproject.metrics import RequestMetrics, remove_snapshot, request_metrics
+
+
+class TestRequestMetrics:
+    """Tests for myproject/metrics.py"""
+
+    def test_histogram_buckets_are_cumulative(self, tmp_path):
+        metrics = RequestMetrics(str(tmp_path))
+        metrics.observe("api/login/", "POST", 200, 0.003)
+        metrics.observe("api/login/", "POST", 200, 0.2)
+        metrics.observe("api/login/", "POST", 401, 20)
+
+        text = metrics.render()
+
+        labels = 'route="api/login/",method="POST"'
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in text
+        assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+        assert f"http_request_duration_seconds_count{{{labels}}} 3" in text
+        assert f'http_requests_total{{{labels},status="401"}} 1' in text
+
+    def test_snapshots_from_other_workers_are_summed(self, tmp_path):
+        metrics = RequestMetrics(str(tmp_path))
+        metrics.observe("api/protected/", "GET", 200, 0.01)
+
+        other = RequestMetrics(str(tmp_path))
+        other.observe("api/protected/", "GET", 200, 0.01)
+        # Un pid vivo que no es el del propio proceso
+        (tmp_path / f"{os.getppid()}.json").write_text(json.dumps(other.snapshot()))
+
+        text = metrics.render()
+
+        assert (
+            'http_requests_total{route="api/protected/",method="GET",status="200"} 2'
+            in text
+        )
+
+    def test_orphaned_snapshots_are_pruned(self, tmp_path):
+        metrics = RequestMetrics(str(tmp_path), dump_interval=5)
+        other = RequestMetrics(str(tmp_path))
+        other.observe("api/protected/", "GET", 200, 0.01)
+        snapshot = json.dumps(other.snapshot())
+        # pid inexistente (pid_max de Linux es como mucho 2**22)
+        dead = tmp_path / f"{2**22 + 1}.json"
+        dead.write_text(snapshot)
+        stale = tmp_path / f"{os.getppid()}.json"
+        stale.write_text(snapshot)
+        old = time.time() - 60
+        os.utime(stale, (old, old))
+
+        text = metrics.render()
+
+        assert "http_requests_total{" not in text
+        assert not dead.exists()
+        assert not stale.exists()
+
+    def test_remove_snapshot(self, tmp_path):
+        (tmp_path / "123.json").write_text("{}")
+
+        remove_snapshot(str(tmp_path), 123)
+        remove_snapshot(str(tmp_path), 123)
+
+        assert not (tmp_path / "123.json").exists()
+
+    def test_collectors_are_exported(self, tmp_path):
+        metrics = RequestMetrics(str(tmp_path))
+        metrics.register_collector(lambda: {"access_log_dropped_total": 3})
+
+        assert "access_log_dropped_total 3" in metrics.render()
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_reports_resolved_route(
+    api_client, tmp_path, monkeypatch, settings
+):
+    monkeypatch.setattr(request_metrics, "directory", str(tmp_path))
+    settings.METRICS_TOKEN = "secreto"
+
+    api_client.get("/api/protected/")
+    api_client.get("/no-existe/123/")
+    response = api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer secreto")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert 'route="api/protected/",method="GET",status="401"' in body
+    assert 'route="<unmatched>",method="GET",status="404"' in body
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_is_closed_without_token(api_client, settings):
+    settings.METRICS_TOKEN = ""
+
+    assert api_client.get("/metrics").status_code == 403
+    settings.METRICS_TOKEN = "secreto"
+    assert (
+        api_client.get("/metrics", HTTP_AUTHORIZATION="Bearer otro").status_code == 403
+    )
@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+from django.contrib.auth.models import update_last_login
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from factories import UserFactory
+from myproject.object_cache import (
+    ObjectCache,
+    cached_object,
+    cached_queryset,
+    namespace_for,
+    object_cache,
+)
+from users.models import User
+
+
+@pytest.fixture
+def two_tier():
+    return ObjectCache(alias="objects", maxsize=2, local_ttl=60)
+
+
+def test_hits_local_then_shared_tier(two_tier):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": 1}
+
+    assert two_tier.get_or_compute("ns", "a", compute) == {"value": 1}
+    assert two_tier.get_or_compute("ns", "a", compute) == {"value": 1}
+    two_tier.clear_local()
+    assert two_tier.get_or_compute("ns", "a", compute) == {"value": 1}
+
+    assert len(calls) == 1
+    assert (two_tier.misses, two_tier.local_hits, two_tier.shared_hits) == (1, 1, 1)
+
+
+def test_invalidate_orphans_every_key_of_the_namespace(two_tier):
+    two_tier.get_or_compute("ns", "a", lambda: "old")
+    two_tier.get_or_compute("other", "a", lambda: "kept")
+
+    two_tier.invalidate("ns")
+
+    assert two_tier.get_or_compute("ns", "a", lambda: "new") == "new"
+    assert two_tier.get_or_compute("other", "a", lambda: "recomputed") == "kept"
+
+
+def test_namespace_version_is_kept_in_the_local_tier(two_tier):
+    version = two_tier.version("ns")
+    # Otro worker invalida: este lo ve al vencer local_ttl, sin ir antes
+    # a la caché compartida en cada lectura
+    caches["objects"].incr("objcache:ns:ns")
+
+    assert two_tier.version("ns") == version
+    two_tier.invalidate("ns")
+    assert two_tier.version("ns") == version + 2
+
+
+def test_local_tier_is_bounded(two_tier):
+    for key in "abc":
+        two_tier.get_or_compute("ns", key, lambda: key)
+
+    assert two_tier.stats()["object_cache_local_entries"] == 2
+
+
+def test_concurrent_misses_compute_once(two_tier):
+    calls = []
+    release = threading.Event()
+
+    def slow_compute():
+        calls.append(1)
+        release.wait(1)
+        return "value"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                two_tier.get_or_compute("ns", "hot", slow_compute)
+            )
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_cached_object_is_invalidated_on_save():
+    user = UserFactory(first_name="Ana")
+
+    assert cached_object(User, user.pk).first_name == "Ana"
+    with CaptureQueriesContext(connection) as queries:
+        assert cached_object(User, user.pk).first_name == "Ana"
+    assert len(queries) == 0
+
+    user.first_name = "Eva"
+    user.save()
+
+    assert cached_object(User, user.pk).first_name == "Eva"
+
+
+@pytest.mark.django_db
+def test_cached_queryset_and_metrics():
+    UserFactory.create_batch(2)
+
+    first = cached_queryset(User.objects.order_by("pk"), "all")
+    second = cached_queryset(User.objects.order_by("pk"), "all")
+
+    assert [u.pk for u in first] == [u.pk for u in second]
+    assert object_cache.stats()["object_cache_local_hits_total"] >= 1
+
+
+@pytest.mark.django_db
+def test_login_does_not_invalidate_the_user_namespace():
+    user = UserFactory()
+    namespace = namespace_for(User)
+    version = object_cache.version(namespace)
+
+    update_last_login(None, user)
+    assert object_cache.version(namespace) == version
+
+    user.first_name = "Eva"
+    user.save(update_fields=["first_name"])
+    assert object_cache.version(namespace) != version
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.core.management import call_command
+from myproject.profiler import SamplingProfiler
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    """Tests for myproject/profiler.py"""
+
+    def test_slow_request_writes_collapsed_stacks(self, tmp_path):
+        profiler = SamplingProfiler(str(tmp_path), slow_threshold=0.05, interval=0.001)
+
+        session = profiler.start()
+        _busy(0.1)
+        path = profiler.stop(session, "GET api/users/", 0.1)
+
+        lines = open(path).read().splitlines()
+        assert lines
+        assert all(line.startswith("GET_api/users/;") for line in lines)
+        assert any("test_profiler:_busy" in line for line in lines)
+
+    def test_unwritable_directory_does_not_fail_the_request(self, tmp_path):
+        blocked = tmp_path / "archivo"
+        blocked.write_text("")
+        profiler = SamplingProfiler(
+            str(blocked / "profiles"), slow_threshold=0.05, interval=0.001
+        )
+
+        session = profiler.start()
+        _busy(0.1)
+
+        assert profiler.stop(session, "GET api/users/", 0.1) is None
+
+    def test_fast_unsampled_request_is_discarded(self, tmp_path):
+        profiler = SamplingProfiler(str(tmp_path), slow_threshold=1, interval=0.001)
+
+        session = profiler.start()
+        _busy(0.01)
+
+        assert profiler.stop(session, "GET api/users/", 0.01) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_disabled_profiler_does_not_start_a_thread(self, tmp_path):
+        threads = threading.active_count()
+        profiler = SamplingProfiler(str(tmp_path))
+
+        assert profiler.start() is None
+        assert threading.active_count() == threads
+
+    def test_old_profiles_are_rotated(self, tmp_path):
+        profiler = SamplingProfiler(str(tmp_path), sample_rate=1, max_files=2)
+        for i in range(4):
+            (tmp_path / f"2020010{i}-000000-1-1ms-GET.folded").write_text("a;b 1\n")
+
+        profiler._rotate()
+
+        assert sorted(p.name[:9] for p in tmp_path.iterdir()) == [
+            "20200102-",
+            "20200103-",
+        ]
+
+
+def test_merge_profiles_sums_stacks(tmp_path, capsys):
+    (tmp_path / "1.folded").write_text("GET_api/users/;a;b 2\nGET_api/login/;a 1\n")
+    (tmp_path / "2.folded").write_text("GET_api/users/;a;b 3\n")
+
+    call_command("merge_profiles", directory=str(tmp_path), route="GET_api/users/")
+
+    assert capsys.readouterr().out == "GET_api/users/;a;b 5\n"
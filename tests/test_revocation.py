@@ -0,0 +1,121 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from users.revocation import (
+    BloomFilter,
+    RevocationIndex,
+    revocation_index,
+    revocation_store,
+)
+from users.tokens import IndexedRefreshToken
+
+
+@pytest.fixture(autouse=True)
+def clear_revocation_index():
+    revocation_index.clear()
+    yield
+    revocation_index.clear()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    keys = [f"jti-{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"otro-{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_stale_filter_is_rebuilt_once_in_background():
+    index = RevocationIndex(capacity=100, refresh_interval=300)
+    index._loaded_at = time.monotonic() - 301
+    release = threading.Event()
+    calls = []
+
+    def slow_rebuild():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        index._loaded_at = time.monotonic()
+
+    with mock.patch.object(index, "rebuild", side_effect=slow_rebuild):
+        index._ensure_fresh()
+        index._ensure_fresh()
+        release.set()
+        with index._rebuild_lock:
+            pass
+
+    assert len(calls) == 1
+    assert calls[0] != threading.get_ident()
+
+
+def test_other_workers_see_revocations_before_rebuilding():
+    exp = time.time() + 3600
+    revocation_index.add("jti-otro-worker", exp)
+
+    # Otro worker: filtro ya cargado (vacío) y sin el conjunto ``recent``
+    other = RevocationIndex(capacity=100)
+    other._loaded_at = time.monotonic()
+
+    assert other.is_revoked("jti-otro-worker") is True
+
+
+def test_rejected_marker_is_logged(caplog, monkeypatch):
+    monkeypatch.setattr(revocation_store, "add", lambda *args, **kwargs: False)
+
+    revocation_index.add("jti-sin-lugar", time.time() + 3600)
+
+    assert "REVOCATION_CACHE_SLOTS" in caplog.text
+
+
+@pytest.mark.django_db
+class TestRevocationIndex:
+    """Tests for users/revocation.py and users/tokens.py"""
+
+    def test_refresh_rotation_revokes_old_token(self, api_client, client_user):
+        refresh = str(IndexedRefreshToken.for_user(client_user))
+
+        response = api_client.post("/api/refresh/", {"refresh": refresh})
+        assert response.status_code == 200
+        assert "refresh" in response.data
+
+        response = api_client.post("/api/refresh/", {"refresh": refresh})
+        assert response.status_code == 401
+
+    def test_unrevoked_token_skips_blacklist_query(
+        self, client_user, django_assert_num_queries
+    ):
+        token = IndexedRefreshToken.for_user(client_user)
+        revocation_index.rebuild()
+
+        with django_assert_num_queries(0):
+            token.check_blacklist()
+
+    def test_revoked_token_is_rejected(self, client_user):
+        token = IndexedRefreshToken.for_user(client_user)
+        token.blacklist()
+
+        with pytest.raises(TokenError):
+            token.check_blacklist()
+
+        revocation_index.clear()
+        with pytest.raises(TokenError):
+            token.check_blacklist()
+
+    def test_purge_expired_tokens(self, client_user):
+        IndexedRefreshToken.for_user(client_user).blacklist()
+        IndexedRefreshToken.for_user(client_user)
+        OutstandingToken.objects.update(expires_at=timezone.now() - timedelta(days=1))
+        IndexedRefreshToken.for_user(client_user)
+
+        call_command("purge_expired_tokens", chunk_size=1)
+
+        assert OutstandingToken.objects.count() == 1
@@ -0,0 +1,127 @@
+import multiprocessing
+import time
+
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from myproject.shm_cache import SharedMemoryCache
+from users.throttles import LoginRateThrottle, MultiScopeRateThrottle
+
+
+@pytest.fixture
+def shm_cache(tmp_path):
+    cache = SharedMemoryCache(
+        str(tmp_path / "cache"), {"OPTIONS": {"SLOTS": 64, "SLOT_SIZE": 256}}
+    )
+    yield cache
+    cache.clear()
+
+
+def _incr_many(cache, times):
+    for _ in range(times):
+        cache.incr("counter")
+
+
+class TestSharedMemoryCache:
+    """Tests for myproject/shm_cache.py"""
+
+    def test_set_get_delete(self, shm_cache):
+        shm_cache.set("clave", {"a": 1})
+        assert shm_cache.get("clave") == {"a": 1}
+        assert shm_cache.has_key("clave")
+
+        assert shm_cache.delete("clave") is True
+        assert shm_cache.get("clave", "default") == "default"
+
+    def test_add_does_not_overwrite(self, shm_cache):
+        assert shm_cache.add("clave", 1) is True
+        assert shm_cache.add("clave", 2) is False
+        assert shm_cache.get("clave") == 1
+
+    def test_expired_keys_are_missing(self, shm_cache):
+        shm_cache.set("clave", 1, timeout=0.05)
+        time.sleep(0.1)
+        assert shm_cache.get("clave") is None
+
+    def test_incr(self, shm_cache):
+        shm_cache.set("counter", 10)
+        assert shm_cache.incr("counter", 5) == 15
+        with pytest.raises(ValueError):
+            shm_cache.incr("missing")
+
+    def test_many_keys_survive_collisions_and_deletes(self, shm_cache):
+        for i in range(40):
+            shm_cache.set(f"k{i}", i)
+        for i in range(0, 40, 2):
+            shm_cache.delete(f"k{i}")
+
+        assert shm_cache.get_many([f"k{i}" for i in range(40)]) == {
+            f"k{i}": i for i in range(1, 40, 2)
+        }
+
+    def test_oversized_values_are_not_stored(self, shm_cache):
+        shm_cache.set("grande", "x" * 1000)
+        assert shm_cache.get("grande") is None
+
+    def test_oversized_overwrite_drops_the_old_value(self, shm_cache):
+        shm_cache.set("clave", "chico")
+
+        shm_cache.set("clave", "x" * 1000)
+
+        assert shm_cache.get("clave") is None
+        assert shm_cache.set_many({"clave": "x" * 1000}) == ["clave"]
+
+    def test_without_eviction_a_full_window_rejects_new_keys(self, tmp_path):
+        cache = SharedMemoryCache(
+            str(tmp_path / "noevict"),
+            {"OPTIONS": {"SLOTS": 4, "SLOT_SIZE": 128, "EVICT": False}},
+        )
+        for i in range(4):
+            assert cache.add(f"k{i}", i, timeout=3600)
+
+        assert cache.add("otra", 5, timeout=3600) is False
+        assert [cache.get(f"k{i}") for i in range(4)] == [0, 1, 2, 3]
+        cache.set("k0", 10)
+        assert cache.get("k0") == 10
+
+    def test_update_many_is_read_modify_write(self, shm_cache):
+        shm_cache.set("a", 1)
+
+        result = shm_cache.update_many(
+            ["a", "b"], lambda values: (values, {"a": values["a"] + 1, "b": 1})
+        )
+
+        assert result == {"a": 1}
+        assert shm_cache.get_many(["a", "b"]) == {"a": 2, "b": 1}
+
+    def test_incr_is_atomic_across_processes(self, shm_cache):
+        shm_cache.set("counter", 0)
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=_incr_many, args=(shm_cache, 200)) for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert shm_cache.get("counter") == 800
+
+
+def test_login_throttle_uses_atomic_update(shm_cache, monkeypatch):
+    monkeypatch.setattr(LoginRateThrottle, "cache", shm_cache)
+    request = APIRequestFactory().post("/api/login/", {}, REMOTE_ADDR="10.0.0.9")
+
+    results = [LoginRateThrottle().allow_request(request, None) for _ in range(7)]
+
+    assert results == [True] * 5 + [False] * 2
+
+
+def test_multi_scope_throttle_uses_atomic_update(shm_cache, monkeypatch):
+    monkeypatch.setattr(MultiScopeRateThrottle, "cache", shm_cache)
+    request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.0.0.10"))
+
+    results = [MultiScopeRateThrottle().allow_request(request, None) for _ in range(21)]
+
+    assert results == [True] * 20 + [False]
+    assert shm_cache.get("throttle_user_10.0.0.10")[2] == 20
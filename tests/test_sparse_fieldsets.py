@@ -0,0 +1,63 @@
+import pytest
+from factories import UserFactory
+
+from users import fieldsets
+from users.serializers import UserListSerializer
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_list_returns_only_requested_fields(self, auth_client, monkeypatch):
+        UserFactory.create_batch(3)
+        # El fast path no instancia el serializer por fila
+        monkeypatch.setattr(
+            UserListSerializer,
+            "to_representation",
+            lambda *args: pytest.fail("serializer usado en el fast path"),
+        )
+
+        response = auth_client.get("/api/users/?fields=id,username,role")
+
+        assert response.status_code == 200
+        assert len(response.data["users"]) == 4
+        assert all(
+            set(user) == {"id", "username", "role"} for user in response.data["users"]
+        )
+
+    def test_fast_path_matches_serializer_output(self, auth_client):
+        fields = "id,email,is_active,date_joined"
+
+        sparse = auth_client.get(f"/api/users/?fields={fields}").json()["users"]
+        full = auth_client.get("/api/users/").json()["users"]
+
+        assert sparse == [
+            {name: user[name] for name in fields.split(",")} for user in full
+        ]
+
+    def test_pagination_works_without_key_fields_requested(self, auth_client):
+        UserFactory.create_batch(3)
+
+        first = auth_client.get("/api/users/?fields=username&page_size=2").json()
+        second = auth_client.get(first["next"]).json()
+
+        assert set(second["users"][0]) == {"username"}
+        assert len(first["users"]) + len(second["users"]) == 4
+
+    def test_detail_is_trimmed_too(self, auth_client, client_user):
+        response = auth_client.get(f"/api/users/{client_user.id}/?fields=username")
+
+        assert response.data == {"username": client_user.username}
+
+    def test_unknown_field_is_rejected(self, auth_client):
+        response = auth_client.get("/api/users/?fields=id,password")
+
+        assert response.status_code == 400
+        assert "password" in str(response.data["fields"])
+
+
+def test_represent_converts_only_non_passthrough_values():
+    row = {"id": 1, "date_joined": None, "username": "ana"}
+
+    data = fieldsets.represent(row, {"id": None, "date_joined": str, "username": None})
+
+    assert data == row
@@ -0,0 +1,68 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.test import RequestFactory
+from myproject import sql_stats
+from myproject.access_log import access_log
+from myproject.middleware import RequestLoggingMiddleware
+from users.models import User
+
+
+class TestQueryStats:
+    """Tests for myproject/sql_stats.py"""
+
+    def test_in_lists_of_any_length_share_a_shape(self):
+        stats = sql_stats.QueryStats(repeat_threshold=2)
+        stats.add('SELECT * FROM "t" WHERE "id" IN (%s)', 0.001)
+        stats.add('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)', 0.002)
+
+        assert stats.count == 2
+        assert stats.repeated() == (2, 'SELECT * FROM "t" WHERE "id" IN (%s)')
+
+    def test_below_threshold_is_not_reported(self):
+        stats = sql_stats.QueryStats(repeat_threshold=5)
+        for _ in range(4):
+            stats.add('SELECT 1 FROM "t" WHERE "id" = %s', 0.001)
+
+        assert stats.repeated() is None
+
+    def test_server_timing_splits_db_and_app(self):
+        stats = sql_stats.QueryStats()
+        stats.add("SELECT 1", 0.004)
+
+        header = stats.server_timing(0.010)
+
+        assert header == 'db;dur=4.0;desc="1 queries", app;dur=6.0, total;dur=10.0'
+
+
+@pytest.mark.django_db
+def test_middleware_detects_repeated_queries(captured_messages):
+    users = [User.objects.create_user(username=f"u{i}") for i in range(6)]
+
+    def view(request):
+        for user in users:
+            User.objects.filter(pk=user.pk).exists()
+        return HttpResponse()
+
+    request = RequestFactory().get("/api/users/")
+    request.user = AnonymousUser()
+    response = RequestLoggingMiddleware(view)(request)
+    access_log.flush()
+
+    assert response["Server-Timing"].startswith("db;dur=")
+    assert 'desc="6 queries"' in response["Server-Timing"]
+    assert any("| db=6q/" in message for message in captured_messages)
+    assert any(
+        message.startswith("N+1 GET /api/users/ | 6 queries con la misma forma")
+        for message in captured_messages
+    )
+
+
+@pytest.mark.django_db
+def test_queries_outside_requests_are_not_counted():
+    stats, token = sql_stats.start()
+    sql_stats.stop(token)
+
+    User.objects.exists()
+
+    assert stats.count == 0
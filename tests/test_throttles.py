@@ -1,7 +1,12 @@
 import pytest
-from django.core.cache import cache
+from django.core.cache import cache as default_cache
+from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
-from users.throttles import LoginRateThrottle  # ¡CORRECTO ahora!
+from users.throttles import (  # ¡CORRECTO ahora!
+    LoginRateThrottle,
+    MultiScopeRateThrottle,
+)
+from users.throttles import throttle_cache as cache
 
 
 @pytest.mark.django_db
@@ -72,3 +77,133 @@ class TestLoginRateThrottle:
 
         # Clear cache
         cache.clear()
+
+
+class TestSlidingWindowRateThrottle:
+    """Tests for SlidingWindowRateThrottle.evaluate (5/min via login scope)"""
+
+    def test_blocks_after_limit_within_window(self):
+        throttle = LoginRateThrottle()
+        state = None
+
+        for _ in range(5):
+            allowed, state, _ = throttle.evaluate(state, 120.0)
+            assert allowed is True
+
+        allowed, _, wait = throttle.evaluate(state, 121.0)
+        assert allowed is False
+        assert 0 < wait <= 120
+
+    def test_previous_window_is_weighted(self):
+        throttle = LoginRateThrottle()
+        state = (60.0, 0, 5)
+
+        # A mitad de la ventana siguiente quedan 2.5 "requests" del pasado
+        allowed, state, _ = throttle.evaluate(state, 150.0)
+        assert allowed is True
+        assert state == (120.0, 5, 1)
+
+    def test_old_state_is_discarded(self):
+        throttle = LoginRateThrottle()
+
+        allowed, state, _ = throttle.evaluate((0.0, 5, 5), 600.0)
+
+        assert allowed is True
+        assert state == (600.0, 0, 1)
+
+    def test_wait_allows_next_request(self):
+        throttle = LoginRateThrottle()
+        state = (60.0, 4, 3)
+
+        allowed, _, wait = throttle.evaluate(state, 70.0)
+        assert allowed is False
+
+        allowed, _, _ = throttle.evaluate(state, 70.0 + wait + 0.01)
+        assert allowed is True
+
+    def test_state_is_fixed_size(self):
+        throttle = LoginRateThrottle()
+        request = APIRequestFactory().post(
+            "/api/login/", {}, REMOTE_ADDR="192.168.1.50"
+        )
+        cache.clear()
+
+        for _ in range(3):
+            throttle.allow_request(request, None)
+
+        assert cache.get(throttle.key)[1:] == (0, 3)
+        cache.clear()
+
+    def test_counters_survive_long_lived_keys_in_default_cache(self):
+        throttle = LoginRateThrottle()
+        request = APIRequestFactory().post(
+            "/api/login/", {}, REMOTE_ADDR="192.168.1.60"
+        )
+        for _ in range(3):
+            throttle.allow_request(request, None)
+
+        # Marcadores de revocación, versiones, etc. viven días en "default"
+        for i in range(1000):
+            default_cache.set(f"larga_vida_{i}", True, timeout=7 * 24 * 3600)
+
+        assert cache.get(throttle.key)[1:] == (0, 3)
+        default_cache.clear()
+
+
+class _CountingCache:
+    """Envuelve la caché para contar operaciones"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_many(self, keys):
+        self.calls.append("get_many")
+        return cache.get_many(keys)
+
+    def set_many(self, data, timeout):
+        self.calls.append("set_many")
+        return cache.set_many(data, timeout)
+
+
+@pytest.mark.django_db
+class TestMultiScopeRateThrottle:
+    """Tests for MultiScopeRateThrottle (anon 20/min, user 100/min)"""
+
+    def test_anonymous_request_uses_one_batched_round_trip(self, monkeypatch):
+        counting = _CountingCache()
+        monkeypatch.setattr(MultiScopeRateThrottle, "cache", counting)
+        request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.1.1.1"))
+        cache.clear()
+
+        assert MultiScopeRateThrottle().allow_request(request, None) is True
+
+        assert counting.calls == ["get_many", "set_many"]
+        assert len(cache.get_many(["throttle_anon_10.1.1.1"])) == 1
+        assert len(cache.get_many(["throttle_user_10.1.1.1"])) == 1
+        cache.clear()
+
+    def test_blocks_on_strictest_scope_with_retry_after(self):
+        request = Request(APIRequestFactory().get("/", REMOTE_ADDR="10.1.1.2"))
+        cache.clear()
+
+        results = [
+            MultiScopeRateThrottle().allow_request(request, None) for _ in range(20)
+        ]
+        throttle = MultiScopeRateThrottle()
+
+        assert all(results)
+        assert throttle.allow_request(request, None) is False
+        assert 0 < throttle.wait() <= 120
+        cache.clear()
+
+    def test_authenticated_request_only_uses_user_scope(self, client_user):
+        request = Request(APIRequestFactory().get("/"))
+        request.user = client_user
+        cache.clear()
+
+        results = [
+            MultiScopeRateThrottle().allow_request(request, None) for _ in range(30)
+        ]
+
+        assert all(results)
+        cache.clear()
@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from users.models import RoleTokenVersion
+from users.serializers import CustomTokenObtainPairSerializer
+from users.token_versions import bump_roles, bump_users, get_role_version
+from users.user_cache import user_cache
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    user_cache.clear()
+
+
+@pytest.mark.django_db
+class TestTokenVersions:
+    """Tests for users/token_versions.py"""
+
+    def test_bump_users_is_a_single_update(self, django_assert_num_queries):
+        User.objects.create_user(username="c1", password="x", role="COBRADOR")
+        User.objects.create_user(username="c2", password="x", role="COBRADOR")
+
+        with django_assert_num_queries(1):
+            updated = bump_users(User.objects.filter(role="COBRADOR"))
+
+        assert updated == 2
+        assert set(User.objects.values_list("token_version", flat=True)) == {1}
+
+    def test_bump_roles_increments_version(self):
+        bump_roles(["COBRADOR"])
+        bump_roles(["COBRADOR"])
+
+        assert RoleTokenVersion.objects.get(role="COBRADOR").version == 2
+        assert get_role_version("COBRADOR") == 2
+
+    def test_role_bump_rejects_existing_tokens(self, api_client):
+        user = User.objects.create_user(username="c1", password="x", role="COBRADOR")
+        token = CustomTokenObtainPairSerializer.get_token(user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert api_client.get("/api/protected/").status_code == 200
+
+        bump_roles(["COBRADOR"])
+
+        assert api_client.get("/api/protected/").status_code == 401
+
+    def test_user_bump_rejects_cached_user_tokens(self, api_client, client_user):
+        token = CustomTokenObtainPairSerializer.get_token(client_user).access_token
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert api_client.get("/api/protected/").status_code == 200
+
+        bump_users(User.objects.filter(pk=client_user.pk))
+
+        assert api_client.get("/api/protected/").status_code == 401
+
+    def test_refresh_after_bump_is_rejected(self, api_client, client_user):
+        refresh = CustomTokenObtainPairSerializer.get_token(client_user)
+        bump_users(User.objects.filter(pk=client_user.pk))
+
+        response = api_client.post("/api/refresh/", {"refresh": str(refresh)})
+
+        assert response.status_code == 401
+
+    def test_refresh_loads_the_user_once(self, api_client, client_user):
+        refresh = CustomTokenObtainPairSerializer.get_token(client_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post("/api/refresh/", {"refresh": str(refresh)})
+
+        assert response.status_code == 200
+        user_queries = [q for q in queries if 'FROM "users_user"' in q["sql"]]
+        assert len(user_queries) == 1
+
+
+@pytest.mark.django_db
+class TestTokenRevocationView:
+    def test_admin_can_revoke_by_role(self, api_client, admin_user, get_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(admin_user)}")
+
+        response = api_client.post(
+            "/api/users/revoke_tokens/", {"roles": ["COBRADOR"]}, format="json"
+        )
+
+        assert response.status_code == 200
+        assert get_role_version("COBRADOR") == 1
+
+    def test_non_admin_cannot_revoke(self, api_client, client_user, get_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(client_user)}")
+
+        response = api_client.post(
+            "/api/users/revoke_tokens/", {"roles": ["COBRADOR"]}, format="json"
+        )
+
+        assert response.status_code == 403
+
+    def test_empty_request_is_rejected(self, api_client, admin_user, get_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(admin_user)}")
+
+        response = api_client.post("/api/users/revoke_tokens/", {}, format="json")
+
+        assert response.status_code == 400
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+import pytest
+from factories import UserFactory
+
+from users.export import csv_chunks, ndjson_chunks
+
+
+def body(response):
+    return b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestUserExport:
+    def test_ndjson_streams_one_object_per_user(self, auth_client, admin_user):
+        UserFactory.create_batch(3)
+
+        response = auth_client.get("/api/users/export/")
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in body(response).splitlines()]
+        assert len(rows) == 4
+        assert rows[0]["id"] == admin_user.id
+        assert rows[0]["role"] == "ADMIN"
+        assert "password" not in rows[0]
+
+    def test_csv_has_header_and_rows(self, auth_client):
+        UserFactory.create_batch(2)
+
+        response = auth_client.get("/api/users/export/?type=csv")
+
+        rows = list(csv.reader(io.StringIO(body(response))))
+        assert rows[0][:3] == ["id", "username", "email"]
+        assert len(rows) == 4
+        assert 'filename="users.csv"' in response["Content-Disposition"]
+
+    def test_unknown_type_is_rejected(self, auth_client):
+        response = auth_client.get("/api/users/export/?type=xml")
+
+        assert response.status_code == 400
+
+    def test_non_admin_cannot_export(self, api_client, client_user, get_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(client_user)}")
+
+        response = api_client.get("/api/users/export/")
+
+        assert response.status_code == 403
+
+
+def test_rows_are_written_in_blocks():
+    rows = iter([(i, f"user{i}") for i in range(5)])
+
+    chunks = list(ndjson_chunks(rows, ("id", "username"), chunk_size=2))
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+
+
+def test_empty_csv_still_has_header():
+    assert list(csv_chunks(iter([]), ("id", "username"), 2)) == ["id,username\r\n"]
@@ -0,0 +1,56 @@
+import pytest
+from django.utils import timezone
+from factories import UserFactory
+
+from users.checks import check_filtersets_are_indexed
+from users.filters import UserFilterSet
+from users.models import User
+
+
+def usernames(response):
+    return {user["username"] for user in response.data["users"]}
+
+
+@pytest.mark.django_db
+class TestUserFilters:
+    def test_by_role(self, user_client):
+        UserFactory(username="coord", role="COORDINADOR")
+        UserFactory(username="cobra", role="COBRADOR")
+
+        response = user_client.get("/api/users/?role=COORDINADOR")
+
+        assert response.status_code == 200
+        assert usernames(response) == {"coord"}
+
+    def test_active_joined_this_month(self, user_client):
+        now = timezone.now()
+        UserFactory(username="nuevo")
+        UserFactory(username="inactivo", is_active=False)
+        antiguo = UserFactory(username="antiguo")
+        User.objects.filter(pk=antiguo.pk).update(
+            date_joined=now - timezone.timedelta(days=90)
+        )
+        start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        response = user_client.get(
+            "/api/users/",
+            {"is_active": "true", "joined_after": start.isoformat()},
+        )
+
+        assert response.status_code == 200
+        assert "nuevo" in usernames(response)
+        assert not usernames(response) & {"inactivo", "antiguo"}
+
+    def test_rejects_combination_without_index(self, user_client):
+        response = user_client.get("/api/users/?is_active=true")
+
+        assert response.status_code == 400
+        assert "non_field_errors" in response.data
+
+    def test_invalid_choice(self, user_client):
+        assert user_client.get("/api/users/?role=GERENTE").status_code == 400
+
+
+def test_declared_filters_are_indexed():
+    assert UserFilterSet.unindexed_filters() == []
+    assert check_filtersets_are_indexed(None) == []
@@ -0,0 +1,129 @@
+import io
+
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from factories import UserFactory
+
+from users.hashing import bulk_make_passwords
+from users.importer import import_users
+from users.models import User
+
+PASSWORD = "Cobranza-2026!"
+
+
+def row(username, **extra):
+    return {"username": username, "password": PASSWORD, **extra}
+
+
+@pytest.mark.django_db
+class TestImportUsers:
+    def test_valid_rows_are_created_with_hashed_passwords(self):
+        report = import_users(
+            [row("ana", role="JEFE"), row("beto", email="beto@test.com")],
+            batch_size=1,
+        )
+
+        assert report["created"] == 2
+        assert report["errors"] == []
+        ana = User.objects.get(username="ana")
+        assert ana.role == "JEFE"
+        assert check_password(PASSWORD, ana.password)
+
+    def test_errors_are_reported_per_row(self):
+        UserFactory(username="existing")
+
+        report = import_users(
+            [
+                row("ok"),
+                row("existing"),
+                row("ok"),  # duplicado dentro del mismo archivo
+                {"username": "weak", "password": "123"},
+                row("bad-role", role="GERENTE"),
+            ]
+        )
+
+        assert report["created"] == 1
+        assert [error["row"] for error in report["errors"]] == [2, 3, 4, 5]
+        assert "username" in report["errors"][0]["errors"]
+        assert "password" in report["errors"][2]["errors"]
+        assert "role" in report["errors"][3]["errors"]
+
+    def test_validation_queries_once_per_batch(self, django_assert_max_num_queries):
+        rows = [row(f"user{i}") for i in range(10)]
+
+        with django_assert_max_num_queries(2):
+            import_users(rows, batch_size=5, dry_run=True)
+
+    def test_dry_run_creates_nothing(self):
+        report = import_users([row("ana")], dry_run=True)
+
+        assert report["valid"] == 1
+        assert report["created"] == 0
+        assert not User.objects.filter(username="ana").exists()
+
+
+@pytest.mark.django_db
+class TestImportEndpoint:
+    def test_json_import(self, auth_client):
+        response = auth_client.post(
+            "/api/users/import/", {"users": [row("ana"), row("beto")]}, format="json"
+        )
+
+        assert response.status_code == 201
+        assert response.data["created"] == 2
+        assert response.data["rows_per_second"] > 0
+
+    def test_csv_upload_with_errors(self, auth_client):
+        content = f"username,password,role\nana,{PASSWORD},JEFE\n,x,JEFE\n"
+        upload = SimpleUploadedFile("users.csv", content.encode(), "text/csv")
+
+        response = auth_client.post(
+            "/api/users/import/", {"file": upload}, format="multipart"
+        )
+
+        assert response.status_code == 200
+        assert response.data["created"] == 1
+        assert response.data["errors"][0]["row"] == 2
+
+    def test_rows_per_request_are_capped(self, auth_client, settings):
+        settings.USER_IMPORT_MAX_ROWS = 1
+        content = f"username,password\nana,{PASSWORD}\nbeto,{PASSWORD}\n"
+        upload = SimpleUploadedFile("users.csv", content.encode(), "text/csv")
+
+        response = auth_client.post(
+            "/api/users/import/", {"file": upload}, format="multipart"
+        )
+
+        assert response.status_code == 400
+        assert not User.objects.filter(username__in=["ana", "beto"]).exists()
+
+    def test_non_admin_cannot_import(self, api_client, client_user, get_token):
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(client_user)}")
+
+        response = api_client.post(
+            "/api/users/import/", {"users": [row("ana")]}, format="json"
+        )
+
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_management_command(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(f"username,password\nana,{PASSWORD}\n", encoding="utf-8")
+    out = io.StringIO()
+
+    call_command("import_users", str(path), "--workers=0", stdout=out)
+
+    assert "1 creados" in out.getvalue()
+    assert User.objects.filter(username="ana").exists()
+
+
+def test_bulk_make_passwords_in_a_process_pool():
+    raw_passwords = ["uno", "dos", "tres"]
+
+    encoded = bulk_make_passwords(raw_passwords, workers=2, chunksize=1)
+
+    assert all(check_password(raw, e) for raw, e in zip(raw_passwords, encoded))
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from factories import UserFactory
+
+from users.models import User
+
+
+@pytest.fixture
+def users(admin_user):
+    # Fechas repetidas: el id desempata dentro de la misma date_joined
+    joined = timezone.now() - timedelta(days=1)
+    for index, user in enumerate(UserFactory.create_batch(6)):
+        user.date_joined = joined + timedelta(minutes=index // 2)
+        user.save(update_fields=["date_joined"])
+    return list(User.objects.order_by("date_joined", "id"))
+
+
+def walk(client, url, direction="next"):
+    pages = []
+    while url:
+        body = client.get(url).json()
+        pages.append([user["id"] for user in body["users"]])
+        url = body[direction]
+    return pages, body
+
+
+@pytest.mark.django_db
+class TestUserKeysetPagination:
+    def test_pages_cover_every_user_once_in_key_order(self, auth_client, users):
+        pages, _ = walk(auth_client, "/api/users/?page_size=3")
+
+        assert [pk for page in pages for pk in page] == [user.pk for user in users]
+        assert all(len(page) == 3 for page in pages[:-1])
+
+    def test_previous_link_walks_back(self, auth_client, users):
+        body = auth_client.get("/api/users/?page_size=3").json()
+        last = auth_client.get(body["next"]).json()
+
+        back = auth_client.get(last["previous"]).json()
+
+        assert [user["id"] for user in back["users"]] == [u.pk for u in users[:3]]
+        assert back["previous"] is None
+
+    def test_count_can_be_turned_off(self, auth_client, users):
+        with_count = auth_client.get("/api/users/").json()
+        with CaptureQueriesContext(connection) as queries:
+            without_count = auth_client.get("/api/users/?count=false").json()
+
+        assert with_count["count"] == len(users)
+        assert "count" not in without_count
+        assert not any("COUNT(" in q["sql"].upper() for q in queries.captured_queries)
+
+    def test_deep_page_query_uses_keyset_not_offset(self, auth_client, users):
+        body = auth_client.get("/api/users/?page_size=2").json()
+
+        with CaptureQueriesContext(connection) as queries:
+            auth_client.get(body["next"] + "&count=false")
+
+        listing = [
+            q["sql"] for q in queries.captured_queries if "date_joined" in q["sql"]
+        ]
+        assert listing and "OFFSET" not in listing[-1].upper()
+
+    def test_invalid_cursor_is_404(self, auth_client, users):
+        response = auth_client.get("/api/users/?cursor=garbage")
+
+        assert response.status_code == 404
@@ -0,0 +1,79 @@
+import pytest
+from django.db import connection
+from factories import UserFactory
+
+from users.models import User
+from users.search import _search_fallback, search_users
+
+
+@pytest.fixture
+def people():
+    for username, email in [
+        ("mariana", "mariana@payo.pe"),
+        ("mario", "mr@payo.pe"),
+        ("ana", "ana.mar@payo.pe"),
+        ("pedro", "pedro@payo.pe"),
+    ]:
+        UserFactory(username=username, email=email)
+
+
+def usernames(queryset):
+    return [user.username for user in queryset]
+
+
+@pytest.mark.django_db
+class TestSearchUsers:
+    def test_substring_in_username_or_email(self, people):
+        found = usernames(search_users(User.objects.all(), "mar"))
+
+        assert set(found) == {"mariana", "mario", "ana"}
+        # Los que empiezan por el texto van antes que los que solo lo contienen
+        assert found[-1] == "ana"
+
+    def test_short_term_is_a_username_prefix(self, people):
+        assert set(usernames(search_users(User.objects.all(), "ma"))) == {
+            "mariana",
+            "mario",
+        }
+
+    def test_limit_and_empty_term(self, people):
+        assert len(search_users(User.objects.all(), "payo", limit=2)) == 2
+        assert list(search_users(User.objects.all(), "  ")) == []
+
+    @pytest.mark.skipif(
+        connection.vendor != "postgresql", reason="similitud trigram de Postgres"
+    )
+    def test_typos_match_by_similarity(self, people):
+        assert "mariana" in usernames(search_users(User.objects.all(), "mariama"))
+
+
+@pytest.mark.django_db
+class TestSearchFallback:
+    """``_search_fallback`` no depende del motor: se prueba también en Postgres"""
+
+    def test_exact_then_prefix_then_substring(self, people):
+        UserFactory(username="mar", email="m@payo.pe")
+
+        found = usernames(_search_fallback(User.objects.all(), "mar", 20))
+
+        assert found[0] == "mar"
+        assert set(found[1:3]) == {"mariana", "mario"}
+        assert found[3] == "ana"
+
+    def test_short_term_is_a_username_prefix(self, people):
+        found = usernames(_search_fallback(User.objects.all(), "ma", 20))
+
+        assert found == ["mariana", "mario"]
+
+    def test_limit(self, people):
+        assert len(_search_fallback(User.objects.all(), "payo", 2)) == 2
+
+
+@pytest.mark.django_db
+def test_search_endpoint(api_client, client_user, get_token, people):
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_token(client_user)}")
+
+    response = api_client.get("/api/users/search/?q=pedro&fields=username")
+
+    assert response.status_code == 200
+    assert response.data["users"][0] == {"username": "pedro"}
@@ -1,6 +1,39 @@
+import logging
+import sys
+
+from django_filters.rest_framework import DjangoFilterBackend
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.views import TokenObtainPairView
+from myproject import deadlines
+from myproject.object_cache import cached_object
+
+from .conditional import collection_etag, conditional, row_validators
+from .export import FORMATS, streaming_export
+from .fieldsets import SparseFieldsetMixin
+from .filters import UserFilterSet
+from .hashing import hashing_pool
+from .importer import import_users
+from .models import User
+from .pagination import UserKeysetPagination
+from .permissions import IsAdmin
+from .search import search_users
+from .serializers import (
+    ChangePasswordSerializer,
+    TokenRevocationSerializer,
+    UserImportRequestSerializer,
+    UserListSerializer,
+)
+from .token_versions import bump_roles, bump_user_ids
+from .throttles import LoginRateThrottle
+
+logger = logging.getLogger("django.request")
 
 
 class ProtectedTestView(APIView):
@@ -8,3 +41,176 @@ class ProtectedTestView(APIView):
 
     def get(self, request):
         return Response({"message": "Acceso correcto", "user": request.user.username})
+
+
+class CustomTokenObtainPairView(TokenObtainPairView):
+    """Login JWT; la verificación de contraseña corre en el hashing_pool"""
+
+    if "pytest" in sys.argv[0]:
+        throttle_classes = []
+    else:
+        throttle_classes = [LoginRateThrottle]
+
+    def post(self, request, *args, **kwargs):
+        ip = request.META.get("REMOTE_ADDR")
+        response = super().post(request, *args, **kwargs)
+
+        if response.status_code == 200:
+            logger.warning(f"LOGIN OK | user={request.data.get('username')} | ip={ip}")
+        else:
+            logger.warning(
+                f"LOGIN FAIL | user={request.data.get('username')} | ip={ip}"
+            )
+
+        return response
+
+
+class ChangePasswordView(APIView):
+    """Cambiar contraseña del usuario actual"""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ChangePasswordSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = request.user
+
+        # Verificar contraseña actual
+        if not hashing_pool.check_password(
+            serializer.validated_data["old_password"], user.password
+        ):
+            return Response(
+                {"error": "Contraseña actual incorrecta"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Cambiar contraseña
+        user.password = hashing_pool.make_password(
+            serializer.validated_data["new_password"]
+        )
+        user.save(update_fields=["password"])
+
+        return Response({"message": "Contraseña cambiada exitosamente"})
+
+
+class TokenRevocationView(APIView):
+    """Forzar logout de usuarios o roles completos (solo ADMIN)"""
+
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        serializer = TokenRevocationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        users = bump_user_ids(serializer.validated_data["user_ids"])
+        roles = bump_roles(serializer.validated_data["roles"])
+
+        return Response(
+            {"message": "Tokens invalidados", "users": users, "roles": roles}
+        )
+
+
+class UserViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    """Listado (paginado por cursor, ?fields=...) y detalle de usuarios"""
+
+    queryset = User.objects.all()
+    serializer_class = UserListSerializer
+    pagination_class = UserKeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = UserFilterSet
+    permission_classes = [IsAuthenticated]
+    deadline = 5  # segundos; ver myproject.deadlines
+
+    @conditional(etag_func=collection_etag)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def get_object(self):
+        if self.action != "retrieve":
+            return super().get_object()
+        # Detalle desde object_cache (LRU del worker + caché compartida); se
+        # invalida con cada save() de User
+        pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            user = cached_object(User, pk)
+        except (TypeError, ValueError, ValidationError):
+            user = None
+        if user is None:
+            raise Http404
+        self.check_object_permissions(self.request, user)
+        return user
+
+    @conditional(**row_validators())
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    @conditional(**row_validators(lambda view, request: request.user.pk))
+    def me(self, request):
+        """Perfil del usuario autenticado"""
+        return Response(self.get_serializer(request.user).data)
+
+    # Columnas planas: values_list, sin instancias ni serializer por fila
+    export_fields = (
+        "id",
+        "username",
+        "email",
+        "first_name",
+        "last_name",
+        "role",
+        "is_active",
+        "date_joined",
+        "last_login",
+    )
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAdmin])
+    def export(self, request):
+        """Todos los usuarios en streaming: ?type=ndjson (defecto) o ?type=csv"""
+        kind = request.query_params.get("type", "ndjson")
+        if kind not in FORMATS:
+            return Response(
+                {"error": f"type debe ser uno de: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # El orden por pk recorre el índice primario, sin sort en memoria
+        queryset = self.get_queryset().order_by("pk")
+        return streaming_export(request, queryset, self.export_fields, kind, "users")
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """Usuarios por username/email, por relevancia: ?q=texto&limit=20"""
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        except ValueError:
+            limit = 20
+        results = search_users(
+            self.get_queryset(), request.query_params.get("q", ""), limit
+        )
+        return Response({"users": self.get_serializer(results, many=True).data})
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        permission_classes=[IsAdmin],
+        parser_classes=[JSONParser, MultiPartParser, FormParser],
+    )
+    @deadlines.deadline(25)  # bajo el timeout de 30 s del worker de gunicorn
+    def import_users(self, request):
+        """Alta masiva: JSON {"users": [...]} o CSV en ``file``; ?dry_run=true"""
+        serializer = UserImportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        rows = data["rows"]
+        dry_run = data["dry_run"] or request.query_params.get("dry_run") == "true"
+        # Hashes en línea: un pool por request competiría con el hashing_pool
+        # de los logins y con los demás workers por las CPUs del host
+        report = import_users(rows, workers=0, dry_run=dry_run)
+
+        created = report["created"] and not report["failed"]
+        return Response(
+            report,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
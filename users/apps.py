@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from myproject import checks as project_checks  # noqa: F401
+
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,44 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .token_versions import get_role_version, get_users_generation
+from .user_cache import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que usa los claims del token (role, is_active, ver,
+    rver) y un LRU por worker para no consultar users_user en cada request.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        # Rechazo temprano sin tocar la base de datos
+        if validated_token.get("is_active") is False:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        user_cache.sync_generation(get_users_generation())
+        user = user_cache.get(user_id)
+        if user is None:
+            version = user_cache.version(user_id)
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, user, version)
+        elif api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if validated_token.get("ver", 0) != user.token_version or (
+            validated_token.get("rver", 0) != get_role_version(user.role)
+        ):
+            raise AuthenticationFailed(
+                "El token ha sido revocado", code="token_revoked"
+            )
+
+        return user
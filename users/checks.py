@@ -0,0 +1,22 @@
+from django.core.checks import Error, register
+
+from .filters import indexed_filtersets
+
+
+@register()
+def check_filtersets_are_indexed(app_configs, **kwargs):
+    """Cada filtro de un IndexedFilterSet debe caer en algún índice del modelo"""
+    errors = []
+    for filterset in indexed_filtersets:
+        for name in filterset.unindexed_filters():
+            errors.append(
+                Error(
+                    f"El filtro '{name}' de {filterset.__name__} no usa ningún "
+                    f"índice de {filterset._meta.model._meta.label}.",
+                    hint="Agregue un índice en Meta.indexes (con su migración) "
+                    "o quite el filtro.",
+                    obj=filterset,
+                    id="users.E001",
+                )
+            )
+    return errors
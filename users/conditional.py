@@ -0,0 +1,110 @@
+"""
+GET condicional (ETag / Last-Modified) para acciones de ViewSets.
+
+``@conditional(etag_func, last_modified_func)`` decora una acción: calcula
+los validadores antes de ejecutarla y, si el cliente ya tiene esa versión
+(``If-None-Match`` / ``If-Modified-Since``), responde 304 sin correr la
+acción ni serializar nada. Es el ``condition`` de Django adaptado a
+métodos de ViewSet (las funciones reciben ``self``).
+
+- Detalle: el ETag sale de ``updated_at`` de la fila, leída con
+  ``cached_object`` (sin query si está en ``object_cache``).
+- Colecciones: de la versión del namespace en ``object_cache``, que se
+  incrementa en cada escritura del modelo (sin tocar la tabla).
+
+El ETag incluye un hash de la query string y del formato de respuesta:
+``?fields=``, ``?cursor=`` o ``?page_size=`` dan representaciones distintas.
+"""
+
+import functools
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from myproject.object_cache import cached_object, namespace_for, object_cache
+
+
+def variant(request):
+    """Hash corto de lo que cambia la representación además de los datos"""
+    key = f"{request.META.get('QUERY_STRING', '')}|{request.accepted_renderer.format}"
+    return hashlib.blake2b(key.encode(), digest_size=6).hexdigest()
+
+
+def conditional(etag_func=None, last_modified_func=None):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return method(self, request, *args, **kwargs)
+
+            etag = etag_func(self, request, *args, **kwargs) if etag_func else None
+            etag = quote_etag(etag) if etag else None
+            last_modified = (
+                last_modified_func(self, request, *args, **kwargs)
+                if last_modified_func
+                else None
+            )
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                return response
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                if etag and not response.has_header("ETag"):
+                    response["ETag"] = etag
+                if last_modified and not response.has_header("Last-Modified"):
+                    response["Last-Modified"] = http_date(last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def collection_etag(view, request, *args, **kwargs):
+    namespace = namespace_for(view.queryset.model)
+    return f"{namespace}-{object_cache.version(namespace)}-{variant(request)}"
+
+
+def row_updated_at(model, pk):
+    """``updated_at`` de una fila desde ``object_cache``; ``None`` si no existe"""
+    try:
+        row = cached_object(model, pk)
+    except (TypeError, ValueError, ValidationError):
+        # pk mal formada: que la acción responda su 404 habitual
+        return None
+    return row.updated_at if row is not None else None
+
+
+def row_validators(get_pk=None):
+    """
+    ``etag_func`` y ``last_modified_func`` de una fila para ``conditional``.
+    Por defecto la pk sale de la URL (``lookup_field``); ``get_pk(view,
+    request)`` la cambia (p. ej. ``/me/``). Ambas comparten una sola lectura.
+    """
+
+    def updated_at(view, request, kwargs):
+        if get_pk is not None:
+            pk = get_pk(view, request)
+        else:
+            pk = kwargs.get(view.lookup_url_kwarg or view.lookup_field)
+        memo = view.__dict__.setdefault("_row_updated_at", {})
+        if pk not in memo:
+            memo[pk] = row_updated_at(view.queryset.model, pk)
+        return pk, memo[pk]
+
+    def etag_func(view, request, *args, **kwargs):
+        pk, timestamp = updated_at(view, request, kwargs)
+        if timestamp is None:
+            return None
+        return f"{pk}-{timestamp.timestamp():.6f}-{variant(request)}"
+
+    def last_modified_func(view, request, *args, **kwargs):
+        return updated_at(view, request, kwargs)[1]
+
+    return {"etag_func": etag_func, "last_modified_func": last_modified_func}
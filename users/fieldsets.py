@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets: ``?fields=id,username,role``.
+
+``SparseFieldsetMixin`` (para ViewSets con un ModelSerializer) limita la
+respuesta a los campos pedidos. Si todos son columnas planas del modelo
+(sin ``source`` ni métodos), el listado se arma directo desde
+``.values()``: sin instancias de modelo ni ``to_representation`` por campo,
+salvo para los tipos que el serializer formatea distinto que el JSON
+renderer (fechas, decimales…). Si no, se usa el serializer con los campos
+recortados y ``.only()`` sobre las columnas necesarias.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+# Tipos cuyo valor de .values() ya es la representación JSON final
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+class SparseFieldsetMixin:
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        """Campos pedidos en orden, o ``None`` si no se pidió ``fields``"""
+        if getattr(self, "_requested_fields", False) is not False:
+            return self._requested_fields
+
+        raw = self.request.query_params.get(self.fields_query_param)
+        requested = None
+        if raw:
+            names = (name.strip() for name in raw.split(","))
+            requested = list(dict.fromkeys(name for name in names if name))
+            available = self.serializer_fields()
+            unknown = [name for name in requested if name not in available]
+            if unknown:
+                message = f"Campos desconocidos: {', '.join(unknown)}"
+                raise ValidationError({self.fields_query_param: message})
+        self._requested_fields = requested
+        return requested
+
+    def serializer_fields(self):
+        if not hasattr(self, "_serializer_fields"):
+            self._serializer_fields = self.get_serializer_class()().fields
+        return self._serializer_fields
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = self.get_requested_fields()
+        if requested is not None:
+            target = serializer.child if hasattr(serializer, "child") else serializer
+            for name in list(target.fields):
+                if name not in requested:
+                    target.fields.pop(name)
+        return serializer
+
+    def plain_columns(self, requested):
+        """
+        ``{campo: convertidor}`` si todos los campos pedidos son columnas
+        planas; ``None`` si alguno necesita el serializer.
+        """
+        serializer_fields = self.serializer_fields()
+        model = self.queryset.model
+        columns = {}
+        for name in requested:
+            field = serializer_fields[name]
+            if field.source != name or isinstance(
+                field, (serializers.SerializerMethodField, serializers.RelatedField)
+            ):
+                return None
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete or model_field.is_relation:
+                return None
+            passthrough = isinstance(field, PASSTHROUGH_FIELDS)
+            columns[name] = None if passthrough else field.to_representation
+        return columns
+
+    def key_fields(self):
+        """Columnas que la paginación necesita además de las pedidas"""
+        return tuple(getattr(self.pagination_class, "ordering", ()) or ())
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.get_requested_fields()
+        if requested is None:
+            return queryset
+        model = queryset.model
+        concrete = {f.name for f in model._meta.concrete_fields}
+        needed = [n for n in (*requested, *self.key_fields()) if n in concrete]
+        return queryset.only(model._meta.pk.name, *needed)
+
+    def list(self, request, *args, **kwargs):
+        requested = self.get_requested_fields()
+        columns = self.plain_columns(requested) if requested is not None else None
+        if columns is None:
+            return super().list(request, *args, **kwargs)
+
+        extra = [name for name in self.key_fields() if name not in columns]
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns, *extra)
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else queryset
+        data = [represent(row, columns) for row in rows]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+def represent(row, columns):
+    data = {}
+    for name, convert in columns.items():
+        value = row[name]
+        data[name] = value if convert is None or value is None else convert(value)
+    return data
@@ -0,0 +1,102 @@
+"""
+FilterSets respaldados por índices.
+
+``IndexedFilterSet`` deriva los índices del modelo (``Meta.indexes`` con
+``fields``, la pk y los campos ``unique``) y:
+
+- al validar cada request rechaza (400) las combinaciones en las que
+  ninguna columna filtrada encabeza un índice, porque Postgres tendría
+  que recorrer la tabla entera;
+- expone ``unindexed_filters()`` para el system check ``users.E001``, que
+  falla si algún filtro declarado no aparece en ningún índice.
+"""
+
+import django_filters
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.forms.utils import ErrorDict
+from rest_framework.settings import api_settings
+
+from .models import User
+
+EMPTY_VALUES = (None, "", [], ())
+
+indexed_filtersets = []
+
+
+def model_indexes(model):
+    """Columnas de cada índice btree/compuesto del modelo, en orden"""
+    indexes = [(model._meta.pk.name,)]
+    indexes += [(field.name,) for field in model._meta.fields if field.unique]
+    for index in model._meta.indexes:
+        if index.fields:
+            indexes.append(tuple(name.lstrip("-") for name in index.fields))
+    return indexes
+
+
+class IndexedFilterSet(django_filters.FilterSet):
+    unindexed_message = (
+        "Combinación de filtros sin índice: agregue al menos uno de {leading}."
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        indexed_filtersets.append(cls)
+
+    @classmethod
+    def leading_columns(cls):
+        return {columns[0] for columns in model_indexes(cls._meta.model)}
+
+    @classmethod
+    def unindexed_filters(cls):
+        indexes = model_indexes(cls._meta.model)
+        indexed = {name for columns in indexes for name in columns}
+        return [
+            name
+            for name, filter_ in cls.base_filters.items()
+            if filter_.field_name not in indexed
+        ]
+
+    @property
+    def errors(self):
+        # DjangoFilterBackend responde 400 con estos errores: los que no son
+        # de un campo van bajo la misma clave que el resto de la API
+        errors = super().errors
+        if NON_FIELD_ERRORS in errors:
+            errors = ErrorDict(errors)
+            errors[api_settings.NON_FIELD_ERRORS_KEY] = errors.pop(NON_FIELD_ERRORS)
+        return errors
+
+    def is_valid(self):
+        if not super().is_valid():
+            return False
+
+        filtered = {
+            self.filters[name].field_name
+            for name, value in self.form.cleaned_data.items()
+            if value not in EMPTY_VALUES
+        }
+        leading = self.leading_columns() & {f.field_name for f in self.filters.values()}
+        if filtered and not filtered & leading:
+            self.form.add_error(
+                None,
+                self.unindexed_message.format(leading=", ".join(sorted(leading))),
+            )
+            return False
+        return True
+
+
+class UserFilterSet(IndexedFilterSet):
+    """
+    ``?role=COORDINADOR``, ``?is_active=true&joined_after=2026-10-01``…
+    ``role`` usa ``users_role_active_joined_idx``; el rango de
+    ``date_joined`` usa ``users_user_joined_id_idx``. ``is_active`` solo
+    acota dentro de uno de ellos.
+    """
+
+    role = django_filters.ChoiceFilter(choices=User.ROLE_CHOICES)
+    is_active = django_filters.BooleanFilter()
+    joined = django_filters.IsoDateTimeFromToRangeFilter(field_name="date_joined")
+
+    class Meta:
+        model = User
+        fields = ["role", "is_active"]
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import django
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class HashingPoolSaturated(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Servicio de autenticación saturado, intente nuevamente."
+    default_code = "hashing_pool_saturated"
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def _check_password(raw_password, encoded):
+    if encoded is None:
+        # Mismo costo que un login válido para no revelar si el usuario existe
+        hashers.make_password(raw_password)
+        return False
+    return hashers.check_password(raw_password, encoded)
+
+
+def _make_password(raw_password):
+    return hashers.make_password(raw_password)
+
+
+def must_update(encoded):
+    """
+    Misma regla que ``hashers.verify_password``: rehashear si cambió el
+    hasher preferido o si el actual pide más iteraciones.
+    """
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+class PasswordHashingPool:
+    """
+    Pool de procesos acotado para PBKDF2.
+
+    Los hashes se calculan fuera del worker de gunicorn. En WSGI el hilo del
+    request espera el resultado, por eso los workers son ``gthread``
+    (``WEB_THREADS``): el resto de los hilos sigue atendiendo. En ASGI
+    ``acheck_password`` / ``amake_password`` esperan sin bloquear el event
+    loop. El pool es por worker: en el host corren hasta
+    ``WEB_CONCURRENCY × HASHING_POOL_WORKERS`` procesos de hashing.
+    Si hay más de ``max_pending`` tareas en curso se responde 503 de
+    inmediato en lugar de encolar. Con ``max_workers=0`` se ejecuta en línea.
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, timeout=10):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_init_worker,
+                        initargs=(
+                            os.environ.get(
+                                "DJANGO_SETTINGS_MODULE", "myproject.settings"
+                            ),
+                        ),
+                    )
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingPoolSaturated()
+
+        if not self.max_workers:
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _result(self, fn, *args):
+        result = self._run(fn, *args)
+        if not self.max_workers:
+            return result
+        try:
+            return result.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise HashingPoolSaturated() from e
+
+    async def _aresult(self, fn, *args):
+        result = self._run(fn, *args)
+        if not self.max_workers:
+            return result
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(result), timeout=self.timeout
+            )
+        except asyncio.TimeoutError as e:
+            raise HashingPoolSaturated() from e
+
+    def check_password(self, raw_password, encoded):
+        return self._result(_check_password, raw_password, encoded)
+
+    def make_password(self, raw_password):
+        return self._result(_make_password, raw_password)
+
+    async def acheck_password(self, raw_password, encoded):
+        return await self._aresult(_check_password, raw_password, encoded)
+
+    async def amake_password(self, raw_password):
+        return await self._aresult(_make_password, raw_password)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def bulk_make_passwords(raw_passwords, workers=None, chunksize=16):
+    """
+    Hashes de muchas contraseñas repartidos en ``workers`` procesos.
+
+    Usa un pool propio y efímero: una importación masiva no debe ocupar los
+    procesos del ``hashing_pool`` que atienden los logins. Con
+    ``workers=0`` se calcula en línea.
+    """
+    raw_passwords = list(raw_passwords)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not workers or len(raw_passwords) <= 1:
+        return [_make_password(raw) for raw in raw_passwords]
+
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(raw_passwords)),
+        initializer=_init_worker,
+        initargs=(os.environ.get("DJANGO_SETTINGS_MODULE", "myproject.settings"),),
+    ) as executor:
+        return list(executor.map(_make_password, raw_passwords, chunksize=chunksize))
+
+
+hashing_pool = PasswordHashingPool(
+    max_workers=getattr(settings, "HASHING_POOL_WORKERS", 2),
+    max_pending=getattr(settings, "HASHING_POOL_MAX_PENDING", 32),
+    timeout=getattr(settings, "HASHING_POOL_TIMEOUT", 10),
+)
@@ -0,0 +1,157 @@
+"""
+Importación masiva de usuarios.
+
+1. Valida las filas por lotes: cada fila con ``UserImportSerializer`` (sin
+   queries) y la unicidad de username con una query por lote.
+2. Calcula los hashes PBKDF2 de todas las filas válidas en un pool de
+   procesos (``bulk_make_passwords``).
+3. Inserta con ``bulk_create`` por lotes. Si un lote choca con una fila
+   insertada entretanto (IntegrityError), ese lote se reintenta fila a fila
+   para reportar solo las que fallan.
+
+Devuelve un reporte con los errores por fila (número de fila desde 1) y el
+throughput.
+"""
+
+import csv
+import io
+import itertools
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from myproject.object_cache import invalidate_model
+
+from .hashing import bulk_make_passwords
+from .models import User
+from .serializers import UserImportSerializer
+
+
+def _batches(items, size):
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def read_csv(fileobj, limit=None):
+    """
+    Filas (dicts) de un CSV con cabecera; acepta archivos binarios o de
+    texto. Con ``limit`` lee como mucho ``limit`` filas.
+    """
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    return [
+        {key.strip(): value for key, value in row.items() if key}
+        for row in itertools.islice(csv.DictReader(fileobj), limit)
+    ]
+
+
+def validate_rows(rows, batch_size):
+    """``(válidas, errores)``; válidas es una lista de ``(fila, datos)``"""
+    valid, errors = [], []
+    seen = set()  # usernames ya aceptados en lotes anteriores del archivo
+
+    numbered = list(enumerate(rows, start=1))
+    for batch in _batches(numbered, batch_size):
+        candidates = []
+        for number, row in batch:
+            serializer = UserImportSerializer(data=row)
+            if not serializer.is_valid():
+                errors.append({"row": number, "errors": serializer.errors})
+                continue
+            candidates.append((number, serializer.validated_data))
+
+        usernames = {data["username"] for _, data in candidates}
+        taken = set(
+            User.objects.filter(username__in=usernames).values_list(
+                "username", flat=True
+            )
+        )
+
+        for number, data in candidates:
+            if data["username"] in taken or data["username"] in seen:
+                errors.append(
+                    {
+                        "row": number,
+                        "errors": {
+                            "username": ["Ya existe un usuario con este username."]
+                        },
+                    }
+                )
+                continue
+            seen.add(data["username"])
+            valid.append((number, data))
+
+    return valid, errors
+
+
+def _insert(batch):
+    """Inserta un lote; devuelve ``(creados, errores)``"""
+    users = [user for _, user in batch]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+        return len(users), []
+    except IntegrityError:
+        pass
+
+    created, errors = 0, []
+    for number, user in batch:
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+            created += 1
+        except IntegrityError as e:
+            errors.append({"row": number, "errors": {"non_field_errors": [str(e)]}})
+    return created, errors
+
+
+def import_users(rows, batch_size=None, workers=None, dry_run=False):
+    """Importa ``rows`` (dicts) y devuelve el reporte"""
+    batch_size = batch_size or getattr(settings, "USER_IMPORT_BATCH_SIZE", 500)
+    if workers is None:
+        workers = getattr(settings, "USER_IMPORT_HASHING_WORKERS", None)
+    rows = list(rows)
+    start = time.perf_counter()
+
+    valid, errors = validate_rows(rows, batch_size)
+    validated_at = time.perf_counter()
+
+    created = 0
+    if valid and not dry_run:
+        hashes = bulk_make_passwords(
+            [data.pop("password") for _, data in valid], workers=workers
+        )
+        hashed_at = time.perf_counter()
+
+        pending = [
+            (number, User(password=encoded, **data))
+            for (number, data), encoded in zip(valid, hashes)
+        ]
+        for batch in _batches(pending, batch_size):
+            batch_created, batch_errors = _insert(batch)
+            created += batch_created
+            errors.extend(batch_errors)
+        if created:
+            # bulk_create no dispara post_save
+            invalidate_model(User)
+    else:
+        hashed_at = validated_at
+
+    elapsed = time.perf_counter() - start
+    errors.sort(key=lambda error: error["row"])
+    return {
+        "rows": len(rows),
+        "valid": len(valid),
+        "created": created,
+        "failed": len(errors),
+        "dry_run": dry_run,
+        "errors": errors,
+        "timings": {
+            "validate": round(validated_at - start, 3),
+            "hash": round(hashed_at - validated_at, 3),
+            "insert": round(elapsed - (hashed_at - start), 3),
+            "total": round(elapsed, 3),
+        },
+        "rows_per_second": round(len(rows) / elapsed, 1) if elapsed else None,
+    }
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from unittest import mock
+from wsgiref.util import setup_testing_defaults
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.throttling import SimpleRateThrottle
+
+from users.serializers import CustomTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = "Mide en proceso el throughput WSGI vs ASGI de los endpoints indicados"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--path", action="append", dest="paths")
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument(
+            "--rate",
+            default="1000000/min",
+            help="Tasa de throttling durante el benchmark (vacío = la configurada)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["username"])
+        except get_user_model().DoesNotExist as e:
+            raise CommandError("Usuario no encontrado") from e
+
+        token = str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+        authorization = f"Bearer {token}"
+
+        rates = SimpleRateThrottle.THROTTLE_RATES
+        overrides = (
+            {scope: options["rate"] for scope in rates} if options["rate"] else {}
+        )
+
+        for path in options["paths"] or ["/api/protected/"]:
+            with mock.patch.dict(rates, overrides):
+                wsgi = self.bench_wsgi(path, authorization, options)
+                asgi = asyncio.run(self.bench_asgi(path, authorization, options))
+            self.stdout.write(
+                f"{path}: WSGI {wsgi:,.0f} req/s | ASGI {asgi:,.0f} req/s "
+                f"(concurrencia {options['concurrency']})"
+            )
+
+    def bench_wsgi(self, path, authorization, options):
+        handler = WSGIHandler()
+        statuses = []
+
+        def start_response(status, headers, exc_info=None):
+            statuses.append(status)
+
+        total = options["requests"]
+        start = time.perf_counter()
+        for _ in range(total):
+            environ = {
+                "PATH_INFO": path,
+                "HTTP_HOST": options["host"],
+                "HTTP_AUTHORIZATION": authorization,
+            }
+            setup_testing_defaults(environ)
+            response = handler(environ, start_response)
+            b"".join(response)
+            response.close()
+        elapsed = time.perf_counter() - start
+
+        self.check_statuses(statuses, lambda status: status.startswith("200"))
+        return total / elapsed
+
+    async def bench_asgi(self, path, authorization, options):
+        handler = ASGIHandler()
+        statuses = []
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [
+                (b"host", options["host"].encode()),
+                (b"authorization", authorization.encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": (options["host"], 80),
+        }
+
+        async def one_request():
+            done = asyncio.Event()
+            sent_body = False
+
+            async def receive():
+                nonlocal sent_body
+                if not sent_body:
+                    sent_body = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            await handler(scope, receive, send)
+            done.set()
+
+        semaphore = asyncio.Semaphore(options["concurrency"])
+
+        async def limited():
+            async with semaphore:
+                await one_request()
+
+        total = options["requests"]
+        start = time.perf_counter()
+        await asyncio.gather(*(limited() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+        self.check_statuses(statuses, lambda status: status == 200)
+        return total / elapsed
+
+    def check_statuses(self, statuses, is_ok):
+        failed = [status for status in statuses if not is_ok(status)]
+        if failed:
+            raise CommandError(f"{len(failed)} requests fallaron (p. ej. {failed[0]})")
@@ -0,0 +1,60 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+from users.throttles import (
+    MultiScopeRateThrottle,
+    SlidingWindowAnonRateThrottle,
+    SlidingWindowUserRateThrottle,
+)
+
+CANDIDATES = [
+    ("DRF anon + user", (AnonRateThrottle, UserRateThrottle)),
+    (
+        "Ventana deslizante anon + user",
+        (SlidingWindowAnonRateThrottle, SlidingWindowUserRateThrottle),
+    ),
+    ("MultiScopeRateThrottle", (MultiScopeRateThrottle,)),
+]
+
+
+class Command(BaseCommand):
+    help = "Compara el costo por request de los throttles de DRF vs los del proyecto"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000)
+        parser.add_argument("--clients", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        requests = []
+        for i in range(options["clients"]):
+            request = factory.get(
+                "/api/protected/",
+                REMOTE_ADDR=f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+            )
+            request.user = AnonymousUser()
+            requests.append(request)
+
+        total = options["requests"]
+        for name, throttle_classes in CANDIDATES:
+            cache.clear()
+
+            start = time.perf_counter()
+            for i in range(total):
+                request = requests[i % len(requests)]
+                # Igual que APIView.check_throttles: una instancia por request
+                for throttle_class in throttle_classes:
+                    throttle_class().allow_request(request, None)
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(
+                f"{name}: {elapsed / total * 1e6:.1f} µs/request "
+                f"({total / elapsed:,.0f} req/s)"
+            )
+
+        cache.clear()
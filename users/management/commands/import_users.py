@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from users.importer import import_users, read_csv
+
+
+class Command(BaseCommand):
+    help = "Importa usuarios desde un CSV (username,email,password,first_name,...)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=None)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Procesos para PBKDF2 (por defecto USER_IMPORT_HASHING_WORKERS)",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as f:
+                rows = read_csv(f)
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {options['path']}: {e}") from e
+
+        report = import_users(
+            rows,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            dry_run=options["dry_run"],
+        )
+
+        for error in report["errors"]:
+            self.stderr.write(f"fila {error['row']}: {dict(error['errors'])}")
+
+        timings = report["timings"]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report['created']} creados, {report['failed']} con errores de "
+                f"{report['rows']} filas en {timings['total']}s "
+                f"({report['rows_per_second']} filas/s; validar "
+                f"{timings['validate']}s, hash {timings['hash']}s, "
+                f"insertar {timings['insert']}s)"
+            )
+        )
@@ -0,0 +1,71 @@
+import os
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Une los perfiles .folded de PROFILE_DIR en un único archivo "
+        "para flamegraph.pl / speedscope"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--directory", default=settings.PROFILE_DIR)
+        parser.add_argument(
+            "--route",
+            default="",
+            help="Solo perfiles cuya ruta empiece así (p. ej. 'GET_api/users')",
+        )
+        parser.add_argument("--output", help="Archivo de salida (default: stdout)")
+        parser.add_argument(
+            "--delete", action="store_true", help="Borra los perfiles ya unidos"
+        )
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        if not os.path.isdir(directory):
+            raise CommandError(f"No existe el directorio {directory}")
+
+        stacks = Counter()
+        merged = []
+        for path in self._profiles(directory):
+            if self._merge(path, options["route"], stacks):
+                merged.append(path)
+
+        self._write(stacks, options["output"])
+
+        if options["delete"]:
+            for path in merged:
+                os.remove(path)
+
+        self.stderr.write(
+            f"{len(merged)} perfiles, {sum(stacks.values())} muestras, "
+            f"{len(stacks)} stacks distintos"
+        )
+
+    def _profiles(self, directory):
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".folded"):
+                yield os.path.join(directory, name)
+
+    def _merge(self, path, route, stacks):
+        """Suma a ``stacks`` las líneas de ``path`` que coinciden con ``route``"""
+        matched = False
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack.startswith(route) and count.isdigit():
+                    stacks[stack] += int(count)
+                    matched = True
+        return matched
+
+    def _write(self, stacks, output_path):
+        output = open(output_path, "w") if output_path else self.stdout
+        try:
+            for stack, count in stacks.most_common():
+                output.write(f"{stack} {count}\n")
+        finally:
+            if output_path:
+                output.close()
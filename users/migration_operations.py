@@ -0,0 +1,41 @@
+"""
+Operaciones de migración compartidas por las migraciones de ``users``.
+"""
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """
+    ``CREATE INDEX CONCURRENTLY`` en Postgres: no bloquea las escrituras en
+    la tabla mientras se construye el índice. En otros motores (SQLite en
+    tests) es un ``AddIndex`` normal, o nada con ``postgres_only=True``
+    (índices GIN trigram, opclasses). La migración debe ser ``atomic = False``.
+    """
+
+    def __init__(self, model_name, index, postgres_only=False):
+        super().__init__(model_name, index)
+        self.postgres_only = postgres_only
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if self.postgres_only:
+            kwargs["postgres_only"] = True
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        elif not self.postgres_only:
+            migrations.AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        elif not self.postgres_only:
+            migrations.AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
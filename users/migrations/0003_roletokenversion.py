@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_user_token_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoleTokenVersion",
+            fields=[
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("ADMIN", "Administrador"),
+                            ("JEFE", "Jefe"),
+                            ("COORDINADOR", "Coordinador"),
+                            ("COBRADOR", "Cobrador"),
+                        ],
+                        max_length=20,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "users_role_token_version",
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+from users.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("users", "0003_roletokenversion"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="user",
+            index=models.Index(
+                fields=["date_joined", "id"], name="users_user_joined_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+from users.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("users", "0005_user_updated_at"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("username"),
+                    name="gin_trgm_ops",
+                ),
+                name="users_user_username_trgm",
+            ),
+            postgres_only=True,
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="users_user_email_trgm",
+            ),
+            postgres_only=True,
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name="user",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("username"),
+                    name="text_pattern_ops",
+                ),
+                name="users_user_username_prefix",
+            ),
+            postgres_only=True,
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+from users.migration_operations import AddIndexConcurrentlyIfPostgres
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+    atomic = False
+
+    dependencies = [
+        ("users", "0006_user_search_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name="user",
+            index=models.Index(
+                fields=["role", "is_active", "date_joined"],
+                name="users_role_active_joined_idx",
+            ),
+        ),
+    ]
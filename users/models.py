@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -10,6 +12,42 @@ class User(AbstractUser):
     ]
     
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='COBRADOR')
+    # Se incrementa para invalidar los JWT emitidos antes del cambio
+    token_version = models.PositiveIntegerField(default=0)
+    # Validador de GET condicional (ETag / Last-Modified) del detalle
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'users_user'
+        indexes = [
+            # Clave de la paginación por cursor del listado
+            models.Index(fields=['date_joined', 'id'], name='users_user_joined_id_idx'),
+            # Filtros de UserFilterSet: rol, rol + activos, rol + activos + fecha
+            models.Index(
+                fields=['role', 'is_active', 'date_joined'],
+                name='users_role_active_joined_idx',
+            ),
+            # Búsqueda (users.search): subcadena / similitud y prefijo corto
+            GinIndex(
+                OpClass(Upper('username'), name='gin_trgm_ops'),
+                name='users_user_username_trgm',
+            ),
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='users_user_email_trgm',
+            ),
+            models.Index(
+                OpClass(Upper('username'), name='text_pattern_ops'),
+                name='users_user_username_prefix',
+            ),
+        ]
+
+
+class RoleTokenVersion(models.Model):
+    """Versión de token por rol: incrementarla invalida todos los JWT del rol"""
+
+    role = models.CharField(max_length=20, choices=User.ROLE_CHOICES, primary_key=True)
+    version = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'users_role_token_version'
@@ -0,0 +1,147 @@
+import base64
+import json
+
+from django.db.models import Q
+from myproject.pagination import EXACT, estimated_count
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor sobre una clave ``(campo, id)`` con índice.
+
+    Cada página filtra "después de la última fila vista" en lugar de usar
+    OFFSET, así la página 1000 cuesta lo mismo que la primera. El cursor es
+    opaco (base64 de la clave y la dirección). ``count`` sale de la
+    estimación del planner en tablas grandes (``myproject.pagination``);
+    ``?count=exact`` pide el exacto y ``?count=false`` lo omite.
+    """
+
+    ordering = ("date_joined", "id")
+    page_size = api_settings.PAGE_SIZE or 20
+    max_page_size = 100
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    include_count = True
+    results_key = "results"
+    invalid_cursor_message = "Cursor inválido"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count_approximate = False
+        self.count = self.get_count(queryset, request)
+
+        key, reverse = self.decode_cursor(request, queryset.model)
+        order = [f"-{field}" if reverse else field for field in self.ordering]
+        if key is not None:
+            queryset = queryset.filter(self.after(key, reverse))
+
+        # Una fila de más indica si hay otra página en esa dirección
+        rows = list(queryset.order_by(*order)[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        first, last = (rows[0], rows[-1]) if rows else (None, None)
+        if reverse:
+            self.next_key = self.key_of(last) if last is not None else key
+            self.previous_key = self.key_of(first) if has_more else None
+        else:
+            self.next_key = self.key_of(last) if has_more else None
+            has_previous = key is not None and rows
+            self.previous_key = self.key_of(first) if has_previous else None
+        return rows
+
+    def after(self, key, reverse):
+        """Filas estrictamente después de ``key`` en el orden pedido"""
+        field, tiebreak = self.ordering
+        value, pk = key
+        op = "lt" if reverse else "gt"
+        bound = "lte" if reverse else "gte"
+        # El primer término acota el rango del índice; el OR resuelve empates
+        return Q(**{f"{field}__{bound}": value}) & (
+            Q(**{f"{field}__{op}": value}) | Q(**{f"{tiebreak}__{op}": pk})
+        )
+
+    def key_of(self, obj):
+        # Instancias o filas de .values() (fast path de sparse fieldsets)
+        if isinstance(obj, dict):
+            return tuple(obj[field] for field in self.ordering)
+        return tuple(getattr(obj, field) for field in self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_count(self, queryset, request):
+        param = request.query_params.get(self.count_query_param)
+        if param is None:
+            enabled = self.include_count
+        else:
+            enabled = param.lower() not in ("0", "false")
+        if not enabled:
+            return None
+        exact = param is not None and param.lower() == EXACT
+        count, self.count_approximate = estimated_count(queryset, exact=exact)
+        return count
+
+    # --- cursores ---
+
+    def encode_cursor(self, key, reverse):
+        field = self.ordering[0]
+        value = key[0].isoformat() if hasattr(key[0], "isoformat") else key[0]
+        payload = json.dumps({field: value, "id": key[1], "r": int(reverse)})
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        field, tiebreak = self.ordering
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            value = model._meta.get_field(field).to_python(payload[field])
+            pk = model._meta.get_field(tiebreak).to_python(payload["id"])
+            reverse = bool(payload.get("r"))
+        except Exception as e:
+            raise NotFound(self.invalid_cursor_message) from e
+        if value is None or pk is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (value, pk), reverse
+
+    def get_next_link(self):
+        if self.next_key is None:
+            return None
+        return self.encode_cursor(self.next_key, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_key is None:
+            return None
+        return self.encode_cursor(self.previous_key, reverse=True)
+
+    def get_paginated_response(self, data):
+        body = {}
+        if self.count is not None:
+            body["count"] = self.count
+            body["count_approximate"] = self.count_approximate
+        body["next"] = self.get_next_link()
+        body["previous"] = self.get_previous_link()
+        body[self.results_key] = data
+        return Response(body)
+
+
+class UserKeysetPagination(KeysetPagination):
+    ordering = ("date_joined", "id")
+    results_key = "users"
@@ -0,0 +1,151 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+logger = logging.getLogger(__name__)
+
+# Tabla sin desalojo (ver CACHES["revocations"]): un marcador vivo no se pierde
+revocation_store = ConnectionProxy(caches, "revocations")
+
+
+class BloomFilter:
+    """Filtro de Bloom de tamaño fijo (sin falsos negativos)."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.num_hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key)
+        )
+
+
+class RevocationIndex:
+    """
+    Índice de JTIs revocados por worker, consultado antes de la base de datos.
+
+    - ``recent``: conjunto exacto y acotado de JTIs revocados recientemente.
+    - ``bloom``: filtro reconstruido desde BlacklistedToken cada
+      ``refresh_interval`` segundos; un negativo evita la consulta SQL.
+      Solo la primera carga bloquea; después un único hilo lo reconstruye
+      mientras los requests siguen usando el filtro anterior.
+    - Las revocaciones también se marcan en ``revocation_store`` hasta que
+      vence el token, para que los demás workers las vean antes de su
+      próxima reconstrucción.
+    """
+
+    cache_prefix = "revoked_jti:"
+
+    def __init__(self, capacity=1_000_000, recent_size=10_000, refresh_interval=300):
+        self.capacity = capacity
+        self.recent_size = recent_size
+        self.refresh_interval = refresh_interval
+        self._bloom = BloomFilter(capacity)
+        self._recent = OrderedDict()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+
+    def rebuild(self):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        bloom = BloomFilter(self.capacity)
+        jtis = BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("token__jti", flat=True)
+        for jti in jtis.iterator(chunk_size=5000):
+            bloom.add(jti)
+
+        with self._lock:
+            # Lo revocado durante la reconstrucción sigue en ``recent``
+            for jti in self._recent:
+                bloom.add(jti)
+            self._bloom = bloom
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None:
+            with self._rebuild_lock:
+                if self._loaded_at is None:
+                    self.rebuild()
+        elif time.monotonic() - self._loaded_at > self.refresh_interval:
+            # Si ya hay una reconstrucción en curso no se lanza otra
+            if self._rebuild_lock.acquire(blocking=False):
+                threading.Thread(
+                    target=self._rebuild_in_background,
+                    name="revocation-rebuild",
+                    daemon=True,
+                ).start()
+
+    def _rebuild_in_background(self):
+        # Un filtro desactualizado sigue siendo seguro: lo revocado después
+        # está en ``recent`` (este worker) o en la caché compartida (el resto)
+        try:
+            self.rebuild()
+        finally:
+            self._rebuild_lock.release()
+            connections.close_all()
+
+    def add(self, jti, exp):
+        with self._lock:
+            self._bloom.add(jti)
+            self._recent[jti] = exp
+            self._recent.move_to_end(jti)
+            while len(self._recent) > self.recent_size:
+                self._recent.popitem(last=False)
+
+        key = f"{self.cache_prefix}{jti}"
+        timeout = max(1, int(exp - time.time()))
+        if not revocation_store.add(key, True, timeout=timeout):
+            if not revocation_store.has_key(key):
+                logger.error(
+                    "Tabla de revocaciones llena: los demás workers no verán %s "
+                    "hasta su próxima reconstrucción; suba REVOCATION_CACHE_SLOTS",
+                    jti,
+                )
+
+    def is_revoked(self, jti):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        self._ensure_fresh()
+        if jti in self._recent:
+            return True
+        if revocation_store.get(f"{self.cache_prefix}{jti}"):
+            return True
+        if jti not in self._bloom:
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    def clear(self):
+        with self._lock:
+            self._bloom = BloomFilter(self.capacity)
+            self._recent.clear()
+            self._loaded_at = None
+
+
+revocation_index = RevocationIndex(
+    capacity=getattr(settings, "REVOCATION_BLOOM_CAPACITY", 1_000_000),
+    recent_size=getattr(settings, "REVOCATION_RECENT_SIZE", 10_000),
+    refresh_interval=getattr(settings, "REVOCATION_REFRESH_INTERVAL", 300),
+)
@@ -0,0 +1,85 @@
+"""
+Búsqueda de usuarios por username / email con índices trigram.
+
+En Postgres los filtros van sobre ``UPPER(username)`` y ``UPPER(email)``,
+las mismas expresiones que los índices GIN ``gin_trgm_ops`` de la
+migración 0006, así ``LIKE '%texto%'`` y la similitud (``%``) usan el
+índice en lugar de recorrer ``users_user``:
+
+- 3+ caracteres: subcadena en username o email, o username parecido
+  (errores de tipeo), ordenado por similitud trigram con un extra para
+  los que empiezan por el texto buscado.
+- 1-2 caracteres: los trigramas no sirven; prefijo de username sobre el
+  índice btree ``text_pattern_ops``.
+
+En otros motores (SQLite en tests locales) se usa ``icontains`` con un
+orden exacto > prefijo > subcadena, y el mismo prefijo de username para
+1-2 caracteres.
+"""
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+
+MIN_TRIGRAM_LENGTH = 3
+
+
+def search_users(queryset, term, limit=20):
+    term = term.strip()
+    if not term:
+        return queryset.none()
+    if connections[queryset.db].vendor == "postgresql":
+        return _search_postgres(queryset, term, limit)
+    return _search_fallback(queryset, term, limit)
+
+
+def _search_postgres(queryset, term, limit):
+    needle = term.upper()
+    queryset = queryset.annotate(
+        username_upper=Upper("username"), email_upper=Upper("email")
+    )
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        return queryset.filter(username_upper__startswith=needle).order_by(
+            "username_upper", "id"
+        )[:limit]
+
+    prefix_boost = Case(
+        When(username_upper__startswith=needle, then=Value(1.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+    return (
+        queryset.filter(
+            Q(username_upper__contains=needle)
+            | Q(email_upper__contains=needle)
+            | Q(username_upper__trigram_similar=needle)
+        )
+        .annotate(
+            rank=Greatest(
+                TrigramSimilarity("username_upper", needle),
+                TrigramSimilarity("email_upper", needle),
+            )
+            + prefix_boost
+        )
+        .order_by("-rank", "id")[:limit]
+    )
+
+
+def _search_fallback(queryset, term, limit):
+    if len(term) < MIN_TRIGRAM_LENGTH:
+        queryset = queryset.filter(username__istartswith=term)
+        return queryset.order_by("username", "id")[:limit]
+
+    rank = Case(
+        When(username__iexact=term, then=Value(3.0)),
+        When(username__istartswith=term, then=Value(2.0)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    return (
+        queryset.filter(Q(username__icontains=term) | Q(email__icontains=term))
+        .annotate(rank=rank)
+        .order_by("-rank", "id")[:limit]
+    )
@@ -1,6 +1,19 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_login_failed
 from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from .hashing import hashing_pool, must_update
 from .models import  User
+from .token_versions import get_role_version
+from .tokens import IndexedRefreshToken
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -21,6 +34,25 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class UserListSerializer(serializers.ModelSerializer):
+    """Serializer de lectura para el listado y detalle de /api/users/"""
+
+    class Meta:
+        model = User
+        fields = [
+            "id",
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "role",
+            "is_active",
+            "date_joined",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class UserCreateSerializer(serializers.ModelSerializer):
     """Serializer para creación de usuarios"""
 
@@ -59,6 +91,67 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserImportSerializer(serializers.Serializer):
+    """
+    Fila de una importación masiva. No es un ModelSerializer a propósito:
+    la unicidad de username se comprueba con una query por lote, no por fila.
+    """
+
+    username = serializers.CharField(
+        max_length=150, validators=[UnicodeUsernameValidator()]
+    )
+    email = serializers.EmailField(required=False, allow_blank=True, default="")
+    password = serializers.CharField(write_only=True)
+    first_name = serializers.CharField(
+        required=False, allow_blank=True, max_length=150, default=""
+    )
+    last_name = serializers.CharField(
+        required=False, allow_blank=True, max_length=150, default=""
+    )
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, default="COBRADOR")
+    is_active = serializers.BooleanField(required=False, default=True)
+
+    def validate(self, attrs):
+        password = attrs["password"]
+        candidate = User(**{k: v for k, v in attrs.items() if k != "password"})
+        try:
+            validate_password(password, user=candidate)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({"password": list(e.messages)})
+        return attrs
+
+
+class UserImportRequestSerializer(serializers.Serializer):
+    """JSON ``{"users": [...]}`` o un archivo CSV en ``file``"""
+
+    users = serializers.ListField(
+        child=serializers.DictField(), required=False, allow_empty=False
+    )
+    file = serializers.FileField(required=False)
+    dry_run = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        from .importer import read_csv  # importer usa UserImportSerializer
+
+        if not attrs.get("users") and not attrs.get("file"):
+            raise serializers.ValidationError(
+                "Debe enviar una lista 'users' o un archivo CSV en 'file'"
+            )
+        # Los hashes se calculan dentro del request: el tamaño va acotado
+        limit = getattr(settings, "USER_IMPORT_MAX_ROWS", 20)
+        if attrs.get("users"):
+            rows = attrs["users"]
+        else:
+            rows = read_csv(attrs["file"], limit=limit + 1)
+        if len(rows) > limit:
+            raise serializers.ValidationError(
+                f"Máximo {limit} filas por request; para archivos más grandes "
+                "use `manage.py import_users`"
+            )
+        attrs["rows"] = rows
+        return attrs
+
+
 class UserUpdateSerializer(serializers.ModelSerializer):
     """Serializer para actualización de usuarios"""
 
@@ -91,3 +184,121 @@ class ChangePasswordSerializer(serializers.Serializer):
                 {"new_password": "Las contraseñas no coinciden"}
             )
         return attrs
+
+
+MODEL_BACKEND = "django.contrib.auth.backends.ModelBackend"
+CLEANSED = "********************"  # como en authenticate()
+
+
+class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Serializer para login JWT con claims de rol, estado y versión"""
+
+    token_class = IndexedRefreshToken
+
+    def validate(self, attrs):
+        if list(settings.AUTHENTICATION_BACKENDS) != [MODEL_BACKEND]:
+            # Otros backends: authenticate() completo, sin el hashing_pool
+            return super().validate(attrs)
+
+        # Igual que authenticate() con ModelBackend, pero el PBKDF2 corre en
+        # el hashing_pool
+        username = attrs[self.username_field]
+        user = User.objects.filter(**{self.username_field: username}).first()
+        encoded = user.password if user and user.has_usable_password() else None
+
+        if not hashing_pool.check_password(attrs["password"], encoded) or (
+            not api_settings.USER_AUTHENTICATION_RULE(user)
+        ):
+            user_login_failed.send(
+                sender=__name__,
+                credentials={self.username_field: username, "password": CLEANSED},
+                request=self.context.get("request"),
+            )
+            raise exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        if must_update(encoded):
+            user.password = hashing_pool.make_password(attrs["password"])
+            user.save(update_fields=["password"])
+
+        self.user = user
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        return data
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["role"] = user.role
+        token["is_active"] = user.is_active
+        token["ver"] = user.token_version
+        token["rver"] = get_role_version(user.role)
+        return token
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Serializer para refresh con rotación y revocation_index"""
+
+    token_class = IndexedRefreshToken
+
+    def validate(self, attrs):
+        # Mismo flujo que TokenRefreshSerializer.validate, con un solo parseo
+        # del token y una sola query de users_user (que también valida ver)
+        refresh = self.token_class(attrs["refresh"])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is not None:
+            user = (
+                User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .only("role", "token_version", "is_active")
+                .first()
+            )
+            if not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise exceptions.AuthenticationFailed(
+                    self.error_messages["no_active_account"], "no_active_account"
+                )
+            # Un refresh emitido antes de un bump de versión ya no es válido
+            if refresh.payload.get("ver", 0) != user.token_version or (
+                refresh.payload.get("rver", 0) != get_role_version(user.role)
+            ):
+                raise exceptions.AuthenticationFailed(
+                    "El token ha sido revocado", "token_revoked"
+                )
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenRevocationSerializer(serializers.Serializer):
+    """Serializer para invalidar tokens por usuario o por rol"""
+
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+    roles = serializers.ListField(
+        child=serializers.ChoiceField(choices=User.ROLE_CHOICES),
+        required=False,
+        default=list,
+    )
+
+    def validate(self, attrs):
+        if not attrs["user_ids"] and not attrs["roles"]:
+            raise serializers.ValidationError(
+                "Debe indicar al menos un usuario o un rol"
+            )
+        return attrs
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from myproject.object_cache import invalidate_model
+
+from .models import User
+from .user_cache import user_cache
+
+# update_last_login en cada login: nada de lo que se lista ni del ETag de
+# colección cambia, no vale vaciar la caché de objetos de todos los usuarios
+LOGIN_ONLY = frozenset({"last_login"})
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, update_fields=None, **kwargs):
+    user_cache.invalidate(instance.pk)
+    if update_fields is not None and frozenset(update_fields) <= LOGIN_ONLY:
+        return
+    invalidate_model(User)
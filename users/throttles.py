@@ -1,7 +1,149 @@
-from rest_framework.throttling import SimpleRateThrottle
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    BaseThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
 
+# Alias propio: los contadores no compiten por slots con claves de larga vida
+throttle_cache = ConnectionProxy(caches, "throttle")
 
-class LoginRateThrottle(SimpleRateThrottle):
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Throttle por contador de ventana deslizante aproximada.
+
+    En lugar de la lista de timestamps de SimpleRateThrottle guarda por clave
+    una tupla fija ``(inicio_ventana, contador_anterior, contador_actual)``.
+    El uso estimado es ``anterior * (1 - transcurrido / duracion) + actual``.
+    """
+
+    cache = throttle_cache
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        update_many = getattr(self.cache, "update_many", None)
+        if update_many is not None:
+            # Backend compartido: lectura y escritura en una sola operación atómica
+            allowed, self.wait_seconds = update_many(
+                [self.key], self._apply, 2 * self.duration
+            )
+            return allowed
+
+        allowed, state, self.wait_seconds = self.evaluate(
+            self.cache.get(self.key), self.now
+        )
+        if allowed:
+            self.cache.set(self.key, state, 2 * self.duration)
+        return allowed
+
+    def _apply(self, values):
+        allowed, state, wait = self.evaluate(values.get(self.key), self.now)
+        return (allowed, wait), ({self.key: state} if allowed else {})
+
+    def evaluate(self, state, now):
+        """Devuelve ``(permitido, nuevo_estado, espera)`` sin tocar la caché"""
+        duration = self.duration
+        window = now - now % duration
+        prev, curr = 0, 0
+        if state is not None:
+            start, last_prev, last_curr = state
+            if start == window:
+                prev, curr = last_prev, last_curr
+            elif start == window - duration:
+                prev = last_curr
+
+        elapsed = now - window
+        if prev * (1 - elapsed / duration) + curr + 1 <= self.num_requests:
+            return True, (window, prev, curr + 1), None
+
+        budget = self.num_requests - 1
+        if curr > budget:
+            # Hay que esperar a la próxima ventana, donde ``curr`` pasa a ``prev``
+            wait = (duration - elapsed) + duration * (1 - budget / curr)
+        else:
+            wait = duration * (1 - (budget - curr) / prev) - elapsed
+        return False, state, max(0.0, wait)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class SlidingWindowAnonRateThrottle(SlidingWindowRateThrottle, AnonRateThrottle):
+    pass
+
+
+class SlidingWindowUserRateThrottle(SlidingWindowRateThrottle, UserRateThrottle):
+    pass
+
+
+class MultiScopeRateThrottle(BaseThrottle):
+    """
+    Evalúa todos los scopes aplicables con una sola lectura y escritura.
+
+    Con el backend compartido usa ``update_many`` (atómico); con cualquier
+    otro backend, un ``get_many`` y un ``set_many``. Solo se registra el
+    request si todos los scopes lo permiten.
+    """
+
+    cache = throttle_cache
+    throttle_classes = (SlidingWindowAnonRateThrottle, SlidingWindowUserRateThrottle)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        throttles = {}
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if throttle.rate is None:
+                continue
+            key = throttle.get_cache_key(request, view)
+            if key is not None:
+                throttle.now = throttle.timer()
+                throttles[key] = throttle
+        if not throttles:
+            return True
+
+        timeout = max(2 * throttle.duration for throttle in throttles.values())
+        update_many = getattr(self.cache, "update_many", None)
+        if update_many is not None:
+            allowed, self.wait_seconds = update_many(
+                list(throttles), lambda values: self._apply(throttles, values), timeout
+            )
+            return allowed
+
+        (allowed, self.wait_seconds), updates = self._apply(
+            throttles, self.cache.get_many(list(throttles))
+        )
+        if updates:
+            self.cache.set_many(updates, timeout)
+        return allowed
+
+    def _apply(self, throttles, values):
+        updates, waits = {}, []
+        for key, throttle in throttles.items():
+            allowed, state, wait = throttle.evaluate(values.get(key), throttle.now)
+            if allowed:
+                updates[key] = state
+            else:
+                waits.append(wait)
+        if waits:
+            return (False, max(waits)), {}
+        return (True, None), updates
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginRateThrottle(SlidingWindowRateThrottle):
     scope = "login"
 
     def get_cache_key(self, request, view):
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from myproject.object_cache import invalidate_model
+
+from .models import RoleTokenVersion, User
+
+ROLE_VERSIONS_CACHE_KEY = "token_versions:roles"
+USERS_GENERATION_CACHE_KEY = "token_versions:users"
+
+
+class _LocalValue:
+    """Valor leído de la caché compartida y retenido ``ttl`` segundos por worker"""
+
+    def __init__(self, loader, ttl):
+        self.loader = loader
+        self.ttl = ttl
+        self._value = None
+        self._expires_at = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        if time.monotonic() >= self._expires_at:
+            with self._lock:
+                self._value = self.loader()
+                self._expires_at = time.monotonic() + self.ttl
+        return self._value
+
+    def reset(self):
+        self._expires_at = 0
+
+
+def _load_role_versions():
+    versions = cache.get(ROLE_VERSIONS_CACHE_KEY)
+    if versions is None:
+        versions = dict(RoleTokenVersion.objects.values_list("role", "version"))
+        cache.set(ROLE_VERSIONS_CACHE_KEY, versions, timeout=None)
+    return versions
+
+
+def _load_users_generation():
+    return cache.get_or_set(USERS_GENERATION_CACHE_KEY, 0, timeout=None)
+
+
+_ttl = getattr(settings, "TOKEN_VERSIONS_LOCAL_TTL", 5)
+_role_versions = _LocalValue(_load_role_versions, _ttl)
+_users_generation = _LocalValue(_load_users_generation, _ttl)
+
+
+def get_role_version(role):
+    return _role_versions.get().get(role, 0)
+
+
+def get_users_generation():
+    """Cambia cada vez que se invalidan usuarios con un UPDATE masivo"""
+    return _users_generation.get()
+
+
+def bump_roles(roles):
+    """Invalida los tokens de uno o más roles: un UPDATE y un bump de caché"""
+    roles = list(roles)
+    updated = RoleTokenVersion.objects.filter(role__in=roles).update(
+        version=F("version") + 1
+    )
+    if updated < len(roles):
+        existing = set(
+            RoleTokenVersion.objects.filter(role__in=roles).values_list(
+                "role", flat=True
+            )
+        )
+        RoleTokenVersion.objects.bulk_create(
+            [RoleTokenVersion(role=r, version=1) for r in roles if r not in existing],
+            ignore_conflicts=True,
+        )
+    cache.delete(ROLE_VERSIONS_CACHE_KEY)
+    _role_versions.reset()
+    return len(roles)
+
+
+def bump_users(queryset):
+    """Invalida los tokens de los usuarios del queryset con un solo UPDATE"""
+    updated = queryset.update(token_version=F("token_version") + 1)
+    # update() no dispara post_save: avisamos a los LRU de cada worker
+    try:
+        cache.incr(USERS_GENERATION_CACHE_KEY)
+    except ValueError:
+        cache.set(USERS_GENERATION_CACHE_KEY, 1, timeout=None)
+    _users_generation.reset()
+    invalidate_model(User)
+    return updated
+
+
+def bump_user_ids(user_ids):
+    return bump_users(User.objects.filter(pk__in=user_ids))
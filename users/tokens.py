@@ -0,0 +1,42 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .revocation import revocation_index
+
+
+class IndexedRefreshToken(RefreshToken):
+    """RefreshToken que consulta el revocation_index antes de la base de datos"""
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+
+        if revocation_index.is_revoked(jti):
+            raise TokenError(_("Token is blacklisted"))
+
+    def _outstanding_token(self):
+        # Usamos el user_id del payload: evita un SELECT de users_user
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults={
+                "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+                "created_at": self.current_time,
+                "token": str(self),
+                "expires_at": datetime_from_epoch(self.payload["exp"]),
+            },
+        )
+
+    def blacklist(self):
+        token, _ = self._outstanding_token()
+        result = BlacklistedToken.objects.get_or_create(token=token)
+        revocation_index.add(token.jti, self.payload["exp"])
+        return result
+
+    def outstand(self):
+        return self._outstanding_token()
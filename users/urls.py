@@ -1,12 +1,32 @@
 from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
+from rest_framework_simplejwt.views import TokenRefreshView
 # from .views import UserViewSet
-from .api import ProtectedTestView
+from .api import (
+    ChangePasswordView,
+    CustomTokenObtainPairView,
+    ProtectedTestView,
+    TokenRevocationView,
+    UserViewSet,
+)
 
-# router = DefaultRouter()
-# router.register(r"users", UserViewSet, basename="user")
+router = SimpleRouter()
+router.register(r"users", UserViewSet, basename="user")
 
 urlpatterns = [
-    # path("", include(router.urls)),
+    path("login/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("protected/", ProtectedTestView.as_view()),
+    path(
+        "users/change_password/",
+        ChangePasswordView.as_view(),
+        name="change_password",
+    ),
+    path(
+        "users/revoke_tokens/",
+        TokenRevocationView.as_view(),
+        name="revoke_tokens",
+    ),
+    # Después de las rutas fijas: users/<pk>/ no debe tapar change_password/
+    path("", include(router.urls)),
 ]
@@ -0,0 +1,89 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "user_cache:v:{}"
+
+
+class UserLRUCache:
+    """
+    LRU acotado de usuarios por proceso (worker).
+
+    ``invalidate`` además cambia la versión del usuario en la caché
+    compartida; cada acierto del LRU la compara con la que tenía al cargarse,
+    así un ``save()`` (desactivar, cambiar de rol) se ve en todos los workers
+    del host en el siguiente request y no al vencer ``ttl``.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+
+    def get(self, user_id):
+        # El claim user_id del JWT llega como str; normalizamos la clave
+        user_id = str(user_id)
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at, version = entry
+            if expires_at < time.monotonic():
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+
+        if self.version(user_id) != version:
+            # Otro worker guardó el usuario después de que lo cargáramos
+            self.invalidate_local(user_id)
+            return None
+        # Copia superficial: cada request puede mutar su propio request.user
+        return copy.copy(user)
+
+    def version(self, user_id):
+        """Versión compartida actual; leerla *antes* de cargar el usuario"""
+        return cache.get(VERSION_KEY.format(user_id))
+
+    def set(self, user_id, user, version=None):
+        user_id = str(user_id)
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._data[user_id] = (copy.copy(user), expires_at, version)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate_local(self, user_id):
+        with self._lock:
+            self._data.pop(str(user_id), None)
+
+    def invalidate(self, user_id):
+        self.invalidate_local(user_id)
+        # Basta con que dure ttl: ninguna entrada del LRU vive más que eso
+        cache.set(VERSION_KEY.format(user_id), time.time_ns(), timeout=self.ttl)
+
+    def sync_generation(self, generation):
+        """Vacía el LRU si otra parte del sistema invalidó usuarios en bloque"""
+        if generation != self._generation:
+            with self._lock:
+                self._data.clear()
+                self._generation = generation
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+user_cache = UserLRUCache(
+    maxsize=getattr(settings, "USER_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "USER_CACHE_TTL", 60),
+)